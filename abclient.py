@@ -2,7 +2,12 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-VERSION = "0.2"
+try:  # orjson parses bytes directly, in C
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+VERSION = "0.3"
 FILE_PATH = Path(__file__).resolve()
 VERSION_INFO = f"abclient.py v{VERSION} ({FILE_PATH})"
 
@@ -18,8 +23,8 @@ class AbClient:
         self.config = config or {}
         if self.path.exists():
             try:
-                self.config.update(json.loads(self.path.read_text()))
-            except json.JSONDecodeError:
+                self.config.update(json_loads(self.path.read_bytes()))
+            except ValueError:  # json and orjson decode errors both subclass it
                 pass
 
     def is_on(self, name: str, default: bool = False, *, internal: bool = False) -> bool:
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-ABtools/combobook.py  ·  v1.7  ·  2025-09-01
+ABtools/combobook.py  ·  v1.30  ·  2026-10-15
 
 USAGE
 -----
@@ -22,61 +22,58 @@ python combo_abooks.py --version
 """
 
 from __future__ import annotations
-import argparse, re, shutil, subprocess, sys, textwrap, json
+import argparse, functools, os, re, shutil, stat, string, subprocess, sys, textwrap, json
 from collections import defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import List, Optional
-from difflib import SequenceMatcher
 import errno
+from flatten_discs import DISC_OR_PART_RX
 
-VERSION = "1.7"
+VERSION = "1.30"
 FILE_PATH = Path(__file__).resolve()
 VERSION_INFO = f"%(prog)s v{VERSION} ({FILE_PATH})"
 
 # ───────────── configuration ────────────────────────────────────────────────
-AUDIO_EXTS   = {".mp3", ".m4b", ".m4a", ".flac", ".ogg", ".opus"}
+AUDIO_EXTS   = frozenset({".mp3", ".m4b", ".m4a", ".flac", ".ogg", ".opus"})
 FLATTEN_DISCS = True
 RENAME_TRACKS = False          # Track 001.*, Track 002.* …
-WRITE_TAGS    = True           # needs ffmpeg on PATH
+WRITE_TAGS    = True           # mutagen; ffmpeg on PATH as fallback
 AUTO_YES      = False          # --yes overrides per-run
 
-# “disc / disk / cd / part” + optional ()[]{}
-DISC_RX = re.compile(
-    r'(?:[\(\[{]?)(?:disc|disk|cd|part)[\s_\-]*(?P<num>\d{1,3})(?:[\)\]}]?)',
-    re.IGNORECASE,
-)
-# also match "(1 of 5)" / "(3/5)" patterns
-PART_RX = re.compile(r"\((?P<num>\d{1,3})\s*(?:of|/)?\s*\d{1,3}\)", re.IGNORECASE)
-
 # ︙ — regular expressions carried over from search_and_tag.py — ︙
 TAIL_RX  = re.compile(r"(?:\{[^}]*\})?(?:\s*\d+\.\d{2}\.\d{2})?(?:\s*\d+\s*[kK])?\s*$")
-PAREN_RX = re.compile(r"\([^)]*\)")
 YEAR_RX  = re.compile(r"^(\d{4})\s*[-_]\s*")
-LEAF_RX = re.compile(
-    r"""^\s*
-        (?:(?P<seq>\d+)\s*[-_]\s*)?   # optional  '5 - '
-        (?P<title>.+?)                #          'Jaws of Darkness'
-        \s*\(\s*(?P<year>\d{4})\s*\)  #          '(2003)'
-        \s*$""", re.VERBOSE)
 
 PARENT_RANGE_RX = re.compile(
     r"""^(?P<series>.+?)\s*\(\s*\d{4}\s*-\s*\d{4}\s*\)\s*$""", re.VERBOSE)
-SEQ_TITLE_YEAR_RX = re.compile(
-    r"^\s*(?P<seq>\d+)\s*[-_]\s*(?P<title>.+?)\s*\(\s*(?P<year>\d{4})\s*\)\s*$"
-)
 # ───────────── optional deps ────────────────────────────────────────────────
 try:
     import requests, mutagen
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     from mutagen import File as MFile
+    from mutagen.easyid3 import EasyID3
+    from mutagen.easymp4 import EasyMP4, EasyMP4Tags
+    from mutagen.flac import FLAC
+    from mutagen.id3 import ID3NoHeaderError
+    from mutagen.oggopus import OggOpus
+    from mutagen.oggvorbis import OggVorbis
     from bs4 import BeautifulSoup
+    from rapidfuzz import fuzz, process as fuzz_process
 except ImportError as e:
     sys.exit(
-        "missing dependency: {}  ➜  pip install mutagen requests beautifulsoup4".format(
+        "missing dependency: {}  ➜  pip install mutagen requests beautifulsoup4 rapidfuzz".format(
             e.name
         )
     )
 
+try:  # C parser for the Open Library / Google Books responses
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 # colour
 try:
     from rich import print as rprint
@@ -91,9 +88,11 @@ except ImportError:
             return default if ans=="" else ans in {"y","yes"}
 
 FFMPEG = shutil.which("ffmpeg") if WRITE_TAGS else None
-if WRITE_TAGS and not FFMPEG:
-    rprint("[yellow]⚠ FFmpeg not found – tag writing disabled.[/]")
-    WRITE_TAGS = False
+
+# let the easy interfaces read/write the series keys tags_from_track looks for
+for _key in ("series", "series-part"):
+    EasyID3.RegisterTXXXKey(_key, _key)
+    EasyMP4Tags.RegisterFreeformKey(_key, _key)
     
 
 # ───────────── dataclass ────────────────────────────────────────────────────
@@ -107,15 +106,48 @@ class Meta:
     narr:Optional[str]=None
 
 # ───────────── helpers ──────────────────────────────────────────────────────
+# characters Windows / Audiobookshelf won't accept in a folder name
+_BAD = str.maketrans("", "", '<>:"/\\|?*' + "".join(map(chr, range(32))))
+
+@functools.lru_cache(maxsize=4096)
 def slug(t:str)->str:
-    return re.sub(r'[<>:"/\\|?*\x00-\x1F]',"",t).strip().rstrip(" .")
+    return t.translate(_BAD).strip().rstrip(" .")
+
+def _audio(name:str)->bool:
+    i = name.rfind(".")
+    return i > 0 and name[i:].lower() in AUDIO_EXTS
 
 def leaf_dirs(root:Path)->List[Path]:
-    return [p for p in root.rglob("*")
-            if p.is_dir()
-            and any(f.suffix.lower() in AUDIO_EXTS for f in p.iterdir())
-            and not any(c.is_dir() and any(g.suffix.lower() in AUDIO_EXTS for g in c.iterdir())
-                        for c in p.iterdir())]
+    """
+    Folders that hold audio while none of their sub-folders do.
+    One bottom-up ``os.walk`` sees every child before its parent, so a
+    parent only has to look its children up in the set of audio folders.
+    """
+    top = str(root)
+    with_audio: set[str] = set()
+    leaves: List[Path] = []
+    for dirpath, dirnames, filenames in os.walk(top, topdown=False):
+        children = [os.path.join(dirpath, d) for d in dirnames]
+        audio_child = False
+        for c in children:
+            if c in with_audio:
+                with_audio.discard(c)     # never looked at again
+                audio_child = True
+        if not any(_audio(f) for f in filenames):
+            continue
+        with_audio.add(dirpath)
+        if not audio_child and dirpath != top:
+            leaves.append(Path(dirpath))
+    return sorted(leaves)
+
+def _fast_move(src: Path, dst: Path) -> None:
+    """Single ``rename(2)`` on the same filesystem, ``shutil.move`` across."""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dst))
 
 def safe_move(src: Path, dst: Path, copy: bool = False) -> None:
     """Move ``src`` to ``dst`` (or copy when ``copy`` is True) ensuring no
@@ -130,7 +162,7 @@ def safe_move(src: Path, dst: Path, copy: bool = False) -> None:
             shutil.copy2(src, dst)
         return
     try:
-        shutil.move(str(src), str(dst))
+        _fast_move(src, dst)
     except (PermissionError, OSError) as e:
         if isinstance(e, OSError) and e.errno not in (errno.EXDEV, errno.EACCES):
             raise
@@ -143,11 +175,16 @@ def safe_move(src: Path, dst: Path, copy: bool = False) -> None:
             src.unlink()
 
 # ───────────── existing tag reader ──────────────────────────────────────────
-def tags_from_track(track:Path)->Optional[Meta]:
+def open_tags(track:Path):
+    """Parse ``track`` with mutagen's easy interface (None if unreadable)."""
     try:
-        au = MFile(str(track), easy=True)
+        return MFile(str(track), easy=True)
     except mutagen.MutagenError:
         return None
+
+def tags_from_track(track:Path, au=None)->Optional[Meta]:
+    if au is None:
+        au = open_tags(track)
     if not au or "artist" not in au or "album" not in au:
         return None
     return Meta(
@@ -159,10 +196,44 @@ def tags_from_track(track:Path)->Optional[Meta]:
         narr   = au.get("composer",[None])[0] if "composer" in au else None,
     )
 
-# ───────────── folder-name guess (uses TAIL_RX, PAREN_RX, YEAR_RX) ───────────
+# ───────────── folder-name guess (single-pass parser) ────────────────────────
 def clean_tail(s:str)->str:
     return TAIL_RX.sub("", s).strip()
 
+def _strip_parens(s:str)->str:
+    """Drop every "( … )" group, each ending at the first ")" after its "("."""
+    out, i = [], 0
+    while (j := s.find("(", i)) != -1 and (k := s.find(")", j + 1)) != -1:
+        out.append(s[i:j])
+        i = k + 1
+    out.append(s[i:])
+    return "".join(out)
+
+@functools.lru_cache(maxsize=4096)
+def _parse_leaf_name(name:str)->tuple[Optional[str], str, Optional[str]]:
+    """
+    Split a leaf folder name into (seq, title, year) in one left-to-right pass.
+    "5 - Jaws of Darkness (2003)" → ("5", "Jaws of Darkness", "2003");
+    anything else falls back to the tail-stripped name without "(…)" groups
+    and an optional leading "YYYY - ".
+    """
+    s = name.rstrip()
+    if s.endswith(")") and (i := s.rfind("(")) > 0:
+        year = s[i + 1:-1].strip()
+        head = s[:i].lstrip()
+        if len(year) == 4 and year.isdecimal():
+            j = 0
+            while j < len(head) and head[j].isdecimal():
+                j += 1
+            rest = head[j:].lstrip()
+            if j and rest[:1] in ("-", "_") and rest[1:]:
+                return head[:j], rest[1:].strip(), year
+            return None, head.strip(), year
+    raw = _strip_parens(clean_tail(name)).strip()
+    lead = raw[:4]
+    year = lead if len(lead) == 4 and lead.isdecimal() and raw[4:].lstrip()[:1] in ("-", "_") else None
+    return None, raw, year
+
 def guess_from_folder(leaf: Path) -> Meta:
     """
     1) Parse a leaf folder name like "5 - Jaws of Darkness (2003)" → seq=5, title, year.
@@ -173,19 +244,8 @@ def guess_from_folder(leaf: Path) -> Meta:
        an author (contains a space but isn't just a year).
     4) Return Meta(author, title, year, series, seq, narr=None).
     """
-    # 1) Try to match "Seq - Title (Year)" exactly.
-    m = LEAF_RX.match(leaf.name)
-    if m:
-        seq   = m.group("seq")
-        title = m.group("title").strip()
-        year  = m.group("year")
-    else:
-        # Fallback: strip common tails and try to find a year anywhere
-        seq = None
-        raw = PAREN_RX.sub("", clean_tail(leaf.name)).strip()
-        y   = YEAR_RX.search(raw)
-        year = y.group(1) if y else None
-        title = raw
+    # 1) "Seq - Title (Year)", else the cleaned-up name (cached per folder name)
+    seq, title, year = _parse_leaf_name(leaf.name)
 
     # 2) Look at parent folder for a "<Series> (YYYY-YYYY)" pattern
     parent = leaf.parent
@@ -209,93 +269,111 @@ def guess_from_folder(leaf: Path) -> Meta:
     return Meta(author=author, title=title, year=year, series=series, seq=seq)
 
 # ───────────── online lookup (Open Library ▸ Google Books) ──────────────────
-def ol_search_all(meta: Meta) -> List[Meta]:
-    try:
-        q = f"title:{meta.title} author:{meta.author}"
-        r = requests.get(
-            "https://openlibrary.org/search.json",
-            params={"q": q, "limit": 5}, timeout=10,
-        ).json()
-        out = []
-        for doc in r.get("docs", []):
-            out.append(
-                Meta(
-                    author=", ".join(doc.get("author_name", ["Unknown"])),
-                    title=doc.get("title"),
-                    year=str(doc.get("first_publish_year")) if doc.get("first_publish_year") else None,
-                )
+# one keep-alive session for every lookup instead of a TLS handshake per call
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+))
+
+def _cached_search(fn):
+    """
+    Memoise a provider on the lower-cased (title, author) of the guess.
+    Failed lookups raise inside ``fn`` and are therefore not cached.
+    """
+    cached = functools.lru_cache(maxsize=1024)(fn)
+    @functools.wraps(fn)
+    def search(meta: Meta) -> List[Meta]:
+        try:
+            hits = cached(meta.title.lower(), meta.author.lower())
+        except Exception:
+            return []
+        return [replace(m) for m in hits]
+    return search
+
+@_cached_search
+def ol_search_all(title: str, author: str) -> tuple[Meta, ...]:
+    q = f"title:{title} author:{author}"
+    r = SESSION.get(
+        "https://openlibrary.org/search.json",
+        params={"q": q, "limit": 5}, timeout=10,
+    )
+    r = json_loads(r.content)
+    out = []
+    for doc in r.get("docs", []):
+        out.append(
+            Meta(
+                author=", ".join(doc.get("author_name", ["Unknown"])),
+                title=doc.get("title"),
+                year=str(doc.get("first_publish_year")) if doc.get("first_publish_year") else None,
             )
-        return out
-    except Exception:
-        return []
-
-def gb_search_all(meta: Meta) -> List[Meta]:
-    try:
-        q = f'intitle:"{meta.title}"+inauthor:"{meta.author}"'
-        r = requests.get(
-            "https://www.googleapis.com/books/v1/volumes",
-            params={"q": q, "maxResults": 5}, timeout=10,
-        ).json()
-        out = []
-        for item in r.get("items", []):
-            info = item["volumeInfo"]
-            out.append(
-                Meta(
-                    author=", ".join(info.get("authors", ["Unknown"])),
-                    title=info.get("title"),
-                    year=info.get("publishedDate", "")[:4] or None,
-                )
+        )
+    return tuple(out)
+
+@_cached_search
+def gb_search_all(title: str, author: str) -> tuple[Meta, ...]:
+    q = f'intitle:"{title}"+inauthor:"{author}"'
+    r = SESSION.get(
+        "https://www.googleapis.com/books/v1/volumes",
+        params={"q": q, "maxResults": 5}, timeout=10,
+    )
+    r = json_loads(r.content)
+    out = []
+    for item in r.get("items", []):
+        info = item["volumeInfo"]
+        out.append(
+            Meta(
+                author=", ".join(info.get("authors", ["Unknown"])),
+                title=info.get("title"),
+                year=info.get("publishedDate", "")[:4] or None,
             )
-        return out
-    except Exception:
-        return []
-
-def audible_search_all(meta: Meta) -> List[Meta]:
-    try:
-        q = f"{meta.title} {meta.author}"
-        html = requests.get(
-            "https://www.audible.com/search",
-            params={"keywords": q},
-            headers={"User-Agent": "Mozilla/5.0"},
-            timeout=10,
-        ).text
-        soup = BeautifulSoup(html, "html.parser")
-        out = []
-        for item in soup.select("li.bc-list-item"):
-            title_el = item.select_one("h3")
-            author_el = item.select_one(".authorLabel a")
-            year_el = item.select_one(".releaseDateLabel+span")
-            if not title_el or not author_el:
-                continue
-            year = None
-            if year_el:
-                m = re.search(r"\d{4}", year_el.get_text())
-                if m:
-                    year = m.group(0)
-            out.append(
-                Meta(
-                    author=author_el.get_text(strip=True),
-                    title=title_el.get_text(strip=True),
-                    year=year,
-                )
+        )
+    return tuple(out)
+
+@_cached_search
+def audible_search_all(title: str, author: str) -> tuple[Meta, ...]:
+    q = f"{title} {author}"
+    html = SESSION.get(
+        "https://www.audible.com/search",
+        params={"keywords": q},
+        headers={"User-Agent": "Mozilla/5.0"},
+        timeout=10,
+    ).text
+    soup = BeautifulSoup(html, "html.parser")
+    out = []
+    for item in soup.select("li.bc-list-item"):
+        title_el = item.select_one("h3")
+        author_el = item.select_one(".authorLabel a")
+        year_el = item.select_one(".releaseDateLabel+span")
+        if not title_el or not author_el:
+            continue
+        year = None
+        if year_el:
+            m = re.search(r"\d{4}", year_el.get_text())
+            if m:
+                year = m.group(0)
+        out.append(
+            Meta(
+                author=author_el.get_text(strip=True),
+                title=title_el.get_text(strip=True),
+                year=year,
             )
-            if len(out) >= 5:
-                break
-        return out
-    except Exception:
-        return []
+        )
+        if len(out) >= 5:
+            break
+    return tuple(out)
+
+_PUNCT = str.maketrans("", "", string.punctuation)
 
-def _similarity(a: Meta, b: Meta) -> float:
-    t1 = f"{a.author} {a.title}".lower()
-    t2 = f"{b.author} {b.title}".lower()
-    return SequenceMatcher(None, t1, t2).ratio()
+def _norm(m: Meta) -> str:
+    """Lower-case "author title" without punctuation, prepared once per candidate."""
+    return f"{m.author} {m.title}".lower().translate(_PUNCT)
 
 def choose_meta(guess: Meta) -> Optional[Meta]:
-    candidates = (
-        ol_search_all(guess)
-        + gb_search_all(guess)
-        + audible_search_all(guess)
-    )
+    # the three providers are network-bound, so let their requests overlap
+    providers = (ol_search_all, gb_search_all, audible_search_all)
+    with ThreadPoolExecutor(max_workers=len(providers)) as ex:
+        candidates = [m for hits in ex.map(lambda fn: fn(guess), providers) for m in hits]
     if not candidates:
         return None
 
@@ -308,24 +386,28 @@ def choose_meta(guess: Meta) -> Optional[Meta]:
             seen.add(key)
     candidates = unique
 
-    candidates.sort(key=lambda m: _similarity(guess, m), reverse=True)
+    # score every candidate in one C-level call; results come back best first
+    ranked = fuzz_process.extract(
+        _norm(guess), [_norm(c) for c in candidates],
+        scorer=fuzz.WRatio, limit=len(candidates),
+    )
 
-    for hit in candidates:
-        score = _similarity(guess, hit)
+    for _, score, idx in ranked:
+        hit = candidates[idx]
         rprint(
             f"  guess: [italic]{guess.title}[/] by {guess.author} ({guess.year or '?'})"
         )
         rprint(
-            f"  match: [bold]{hit.title}[/] by {hit.author} ({hit.year or '?'})  score: {score:.2f}"
+            f"  match: [bold]{hit.title}[/] by {hit.author} ({hit.year or '?'})  score: {score:.0f}"
         )
-        if AUTO_YES or Confirm.ask("  use this metadata?", default=score > 0.8):
+        if AUTO_YES or Confirm.ask("  use this metadata?", default=score > 80):
             return hit
     return None
 
-# ───────────── FFmpeg tag writer (title / artist / year) ─────────────────────
-def write_tags(track:Path, meta:Meta, index:int=0, total:int=0):
-    if not WRITE_TAGS: return
-    tmp = track.with_suffix(track.suffix+".tmp")
+# ───────────── tag writer (mutagen, FFmpeg fallback) ─────────────────────────
+def tag_cmd(track:Path, meta:Meta, index:int=0, total:int=0)->List[str]:
+    """Build the FFmpeg command that writes ``meta`` into a temp copy of ``track``."""
+    tmp = track.with_name(f"{track.stem}.tmp{track.suffix}")
     cmd=[FFMPEG,"-nostdin","-loglevel","error","-y","-i",str(track),"-codec","copy",
          "-metadata",f"artist={meta.author}",
          "-metadata",f"album={meta.title}",
@@ -336,18 +418,93 @@ def write_tags(track:Path, meta:Meta, index:int=0, total:int=0):
         cmd += ["-metadata", f"series-part={meta.seq}"]
     if meta.year: cmd+=["-metadata",f"date={meta.year}"]
     if index: cmd += ["-metadata", f"track={index}/{total or index}"]
-    subprocess.run(cmd,stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL)
-    if tmp.exists(): tmp.replace(track)
+    cmd.append(str(tmp))
+    return cmd
+
+def _run_tag_cmd(track:Path, cmd:List[str])->None:
+    tmp = Path(cmd[-1])
+    rc = subprocess.run(cmd,stdout=subprocess.DEVNULL,stderr=subprocess.DEVNULL).returncode
+    if rc == 0 and tmp.exists(): tmp.replace(track)
+    elif tmp.exists(): tmp.unlink()
+
+# containers mutagen can edit in place; anything else goes through FFmpeg
+_TAGGERS = {
+    ".mp3": EasyID3, ".m4a": EasyMP4, ".m4b": EasyMP4,
+    ".flac": FLAC, ".ogg": OggVorbis, ".opus": OggOpus,
+}
+
+def _load_tagger(track:Path):
+    cls = _TAGGERS.get(track.suffix.lower())
+    if cls is None:
+        return None
+    try:
+        return cls(str(track))
+    except ID3NoHeaderError:
+        return EasyID3()              # untagged MP3: new ID3 block on save
+    except mutagen.MutagenError:
+        return None
+
+TAG_PADDING = 8192
+
+def _padding(info)->int:
+    """Reserve 8 KiB of tag padding on the first save, then keep what is left."""
+    return info.padding if info.padding > 0 else TAG_PADDING
+
+def _mutagen_tags(track:Path, meta:Meta, index:int, total:int, au=None)->bool:
+    """Edit the tag frames in place; the audio stream is never rewritten."""
+    if au is None:
+        au = _load_tagger(track)
+    if au is None:
+        return False
+    try:
+        if isinstance(au, mutagen.FileType) and au.tags is None:
+            au.add_tags()
+        au["artist"] = meta.author
+        au["album"]  = meta.title
+        au["title"]  = track.stem
+        if meta.year:   au["date"] = meta.year
+        if meta.series: au["series"] = meta.series
+        if meta.seq:    au["series-part"] = meta.seq
+        if index:       au["tracknumber"] = f"{index}/{total or index}"
+        au.save(str(track), padding=_padding)   # one save for all fields
+    except (mutagen.MutagenError, KeyError, ValueError):
+        return False
+    return True
+
+def _tag_one(track:Path, meta:Meta, index:int, total:int, au=None)->bool:
+    """Tag one track; False if neither mutagen nor FFmpeg could be used."""
+    if _mutagen_tags(track, meta, index, total, au):
+        return True
+    if FFMPEG:
+        _run_tag_cmd(track, tag_cmd(track, meta, index, total))
+        return True
+    rprint(f"[yellow]⚠ could not tag {track.name} (FFmpeg not found)[/]")
+    return False
+
+def write_tags(tracks:List[Path], meta:Meta, handles:Optional[dict]=None)->int:
+    """
+    Tag every track concurrently and return how many could not be tagged.
+    ``handles`` maps tracks to mutagen objects already parsed by
+    tags_from_track so they aren't opened twice.
+    """
+    if not WRITE_TAGS or not tracks: return 0
+    handles = handles or {}
+    total = len(tracks)
+    with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, 8)) as ex:
+        done = ex.map(lambda it: _tag_one(it[1], meta, it[0], total, handles.get(it[1])),
+                      enumerate(tracks, 1))
+        return sum(not ok for ok in done)
 
 # ───────────── disc-flattener ────────────────────────────────────────────────
 def flatten(folder: Path, dry: bool):
     discs = []
-    for p in folder.iterdir():
-        if not p.is_dir():
-            continue
-        m = DISC_RX.search(p.name) or PART_RX.search(p.name)
-        if m:
-            discs.append((int(m.group("num")), p))
+    with os.scandir(folder) as it:
+        for e in it:
+            if not e.is_dir():
+                continue
+            m = DISC_OR_PART_RX.search(e.name)
+            if m:
+                discs.append((int(m.group("dnum") or m.group("pnum")), folder / e.name))
     discs.sort(key=lambda t: t[0])
     if not discs:
         return
@@ -355,7 +512,7 @@ def flatten(folder: Path, dry: bool):
     tracks = []
     single_file = True
     for num, d in discs:
-        disc_tracks = sorted(t for t in d.iterdir() if t.suffix.lower() in AUDIO_EXTS)
+        disc_tracks = sorted(t for t in d.iterdir() if _audio(t.name))
         tracks.extend((num, t) for t in disc_tracks)
         if len(disc_tracks) != 1:
             single_file = False
@@ -369,16 +526,14 @@ def flatten(folder: Path, dry: bool):
             dest = folder / f"Part {num:0{digits}d}{src.suffix.lower()}"
             rprint(f"    {'mv' if not dry else '↪'} {src.name} → {dest.name}")
             if not dry:
-                dest.parent.mkdir(exist_ok=True)
-                shutil.move(str(src), str(dest))
+                _fast_move(src, dest)
     else:
         digits = len(str(len(tracks)))
         for i, (num, src) in enumerate(tracks, 1):
             dest = folder / f"Track {i:0{digits}d}{src.suffix.lower()}"
             rprint(f"    {'mv' if not dry else '↪'} {src.name} → {dest.name}")
             if not dry:
-                dest.parent.mkdir(exist_ok=True)
-                shutil.move(str(src), str(dest))
+                _fast_move(src, dest)
 
     if not dry:
         for _, d in discs:
@@ -389,7 +544,7 @@ def flatten(folder: Path, dry: bool):
 
 # ───────────── track renamer ─────────────────────────────────────────────────
 def rename_tracks(folder:Path):
-    tracks=sorted(p for p in folder.iterdir() if p.suffix.lower() in AUDIO_EXTS)
+    tracks=sorted(p for p in folder.iterdir() if _audio(p.name))
     digits=len(str(len(tracks)))
     for i,p in enumerate(tracks,1):
         new=p.with_name(f"Track {i:0{digits}d}{p.suffix.lower()}")
@@ -401,6 +556,7 @@ def rename_tracks(folder:Path):
 MAX_AUTHOR_LEN = 50
 MAX_SERIES_LEN = 50
 MAX_TITLE_LEN  = 50
+@functools.lru_cache(maxsize=4096)
 def _truncate(name: str, limit: int) -> str:
     """
     Return a slugged version of name truncated to at most `limit` characters,
@@ -450,19 +606,21 @@ def process(folder: Path, lib: Path, dry: bool, yes: bool, copy: bool, summary:
 
     # 1) Gather all audio files in this folder
     audio_files = sorted(
-        p for p in folder.iterdir() if p.suffix.lower() in AUDIO_EXTS
+        p for p in folder.iterdir() if _audio(p.name)
     )
     if not audio_files:
         rprint("• no audio:", folder)
         summary["skip"] += 1
         return
 
-    # 2) Look for the first file that already has valid artist+album tags
+    # 2) A book is either tagged or it isn't: check the first file (and a
+    #    second one in case the first is corrupt) instead of every track
     meta: Optional[Meta] = None
-    for t in audio_files:
-        existing = tags_from_track(t)
-        if existing:
-            meta = existing
+    handles: dict = {}
+    for t in audio_files[:2]:
+        handles[t] = au = open_tags(t)
+        meta = tags_from_track(t, au)
+        if meta:
             break
 
     # 3) If none of the files had tags, do the online‐lookup flow
@@ -477,8 +635,8 @@ def process(folder: Path, lib: Path, dry: bool, yes: bool, copy: bool, summary:
             return
 
         # Write tags to all tracks in this folder
-        for idx, t in enumerate(audio_files, 1):
-            write_tags(t, hit, idx, len(audio_files))
+        if not dry:
+            summary["untagged"] += write_tags(audio_files, hit, handles)
         meta = hit
 
     # 4) At this point 'meta' is guaranteed to contain author/title, etc.
@@ -491,18 +649,21 @@ def process(folder: Path, lib: Path, dry: bool, yes: bool, copy: bool, summary:
             rename_tracks(folder)
 
     dest = dest_path(lib, meta)
-    if dest.exists():
-        # If the series folder exists but is empty, we can still write into it
-        if dest.is_dir() and not any(dest.iterdir()):
-            pass
-        elif dest.is_dir():
-            rprint("[cyan]• book already moved, skip:[/]", dest.relative_to(lib))
-            summary["exists"] += 1
-            return
-        else:
+    try:
+        st = os.stat(dest)      # one syscall answers both "exists" and "is dir"
+    except FileNotFoundError:
+        st = None
+    if st is not None:
+        if not stat.S_ISDIR(st.st_mode):
             rprint("[red]✗ destination collision (file exists), skip:[/]", dest.relative_to(lib))
             summary["exists"] += 1
             return
+        # If the series folder exists but is empty, we can still write into it
+        with os.scandir(dest) as it:
+            if next(it, None) is not None:
+                rprint("[cyan]• book already moved, skip:[/]", dest.relative_to(lib))
+                summary["exists"] += 1
+                return
 
     action = 'cp' if copy else 'mv'
     rprint(f"{action if not dry else '↪'} {folder.relative_to(SRC)} → {dest.relative_to(lib)}")
@@ -529,7 +690,7 @@ def main(src:Path, lib:Path, commit:bool, yes:bool, copy: bool):
     rprint(f"  {action_word:12}: {summary['moved']}")
     if not commit:
         rprint(f"  would_move   : {summary['would_move']}")
-    for k in ("exists","skip"):
+    for k in ("exists","skip","untagged"):
         rprint(f"  {k:12}: {summary[k]}")
 
 if __name__=="__main__":
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 """
-ABtools/find_duplicates.py - v0.4 (2025-09-01)
-Find duplicate audio files by comparing SHA1 hashes or file names.
+ABtools/find_duplicates.py - v0.14 (2026-10-15)
+Find duplicate audio files by comparing content hashes or file names.
+Hashes use BLAKE3 when the ``blake3`` package is installed and BLAKE2b
+otherwise.
 
 Results are written to ``duplicate_log.txt`` in the chosen root folder.
 Use ``--version`` to print the script version and file path.
@@ -9,90 +11,193 @@ Now shows scanning progress.
 """
 
 from __future__ import annotations
-import argparse, hashlib, sys
+import argparse, hashlib, mmap, os, sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
+from typing import Iterator
 
-VERSION = "0.4"
+VERSION = "0.14"
 FILE_PATH = Path(__file__).resolve()
 VERSION_INFO = f"%(prog)s v{VERSION} ({FILE_PATH})"
 
-AUDIO_EXTS = {".mp3", ".m4b", ".m4a", ".flac", ".ogg", ".opus"}
+AUDIO_EXTS = frozenset({".mp3", ".m4b", ".m4a", ".flac", ".ogg", ".opus"})
 
 DUP_LOG = Path("duplicate_log.txt")
 
+try:
+    import blake3
+except ImportError:  # stdlib BLAKE2b instead
+    blake3 = None
+HASH_NAME = "BLAKE3" if blake3 else "BLAKE2b"
 
-def is_audio(p: Path) -> bool:
-    return p.suffix.lower() in AUDIO_EXTS
+READ_SIZE = 1 << 20             # 1 MiB per read() while hashing
+PROBE_SIZE = 64 * 1024          # bytes read from each end for the fingerprint
+HASH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _audio(name: str) -> bool:
+    i = name.rfind(".")
+    return i > 0 and name[i:].lower() in AUDIO_EXTS
 
 
-def sha1sum(path: Path) -> str:
-    h = hashlib.sha1()
-    with path.open('rb') as f:
-        for chunk in iter(lambda: f.read(8192), b""):
+def is_audio(p: Path) -> bool:
+    return _audio(p.name)
+
+
+def _scandir_recursive(path: str) -> Iterator[tuple[str, int]]:
+    """Yield ``(path, size)`` for each audio file below ``path``.
+
+    ``DirEntry`` caches the file type from the directory listing, so the
+    walk costs one ``scandir`` per folder and the size comes from the same
+    pass (free on Windows, one ``lstat`` per file elsewhere).
+    """
+    try:
+        it = os.scandir(path)
+    except OSError as e:
+        print(f"\nCould not scan {path}: {e}", file=sys.stderr)
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scandir_recursive(entry.path)
+            elif entry.is_file(follow_symlinks=False) and _audio(entry.name):
+                try:
+                    yield entry.path, entry.stat(follow_symlinks=False).st_size
+                except OSError as e:
+                    print(f"\nCould not stat {entry.path}: {e}", file=sys.stderr)
+
+
+def hash_file(path: str | Path) -> str:
+    """Return the hex digest of ``path`` using :data:`HASH_NAME`."""
+    if blake3 is not None:
+        # mmap + multithreaded SIMD tree hash on the Rust side
+        h = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        h.update_mmap(str(path))
+        return h.hexdigest()
+    h = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            try:
+                # hand the whole mapping to the C hasher; the OS pages it in
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h.update(mm)
+                return h.hexdigest()
+            except (OSError, ValueError, OverflowError):
+                # cannot map (special file, 32-bit address space): read it
+                h = hashlib.blake2b()
+                f.seek(0)
+        for chunk in iter(lambda: f.read(READ_SIZE), b""):
             h.update(chunk)
     return h.hexdigest()
 
 
-def find_dupes(root: Path, by: str = "hash") -> dict[str, list[Path]]:
-    files = [p for p in root.rglob("*") if p.is_file() and is_audio(p)]
-    total = len(files)
-    print(f"Scanning {total} files...", end="", flush=True)
-    if by == "name":
-        groups: dict[str, list[Path]] = defaultdict(list)
-        for idx, p in enumerate(files, 1):
-            print(f"\rScanning {idx}/{total}...", end="", flush=True)
-            groups[p.name].append(p)
-        print()
-        return {k: v for k, v in groups.items() if len(v) > 1}
+def quick_fingerprint(path: str | Path, size: int) -> bytes:
+    """Cheap digest of the first and last 64 KiB plus the file size.
+
+    Files whose fingerprints differ cannot be duplicates, so only files
+    that still collide here are read end to end.
+    """
+    with open(path, 'rb') as f:
+        head = f.read(PROBE_SIZE)
+        f.seek(max(0, size - PROBE_SIZE))
+        tail = f.read(PROBE_SIZE)
+    return hashlib.blake2b(head + tail + size.to_bytes(8, "little"),
+                           digest_size=16).digest()
+
 
-    # group by file size first to avoid hashing uniques
-    size_map: dict[int, list[Path]] = defaultdict(list)
-    for idx, p in enumerate(files, 1):
-        print(f"\rScanning {idx}/{total}...", end="", flush=True)
+def _collect(jobs: list[tuple[str, Future]]) -> Iterator[tuple[str, list[Path]]]:
+    """Wait for one group's hash jobs and yield the digests shared by 2+ files."""
+    hashes: dict[str, list[str]] = defaultdict(list)
+    for p, fut in jobs:
         try:
-            size_map[p.stat().st_size].append(p)
+            hashes[fut.result()].append(p)
         except OSError as e:
-            print(f"\nCould not stat {p}: {e}", file=sys.stderr)
+            print(f"\nCould not read {p}: {e}", file=sys.stderr)
+    for digest, paths in hashes.items():
+        if len(paths) > 1:
+            yield digest, [Path(x) for x in paths]
+
+
+def find_dupes(root: Path, by: str = "hash") -> Iterator[tuple[str, list[Path]]]:
+    """Yield ``(key, files)`` for each duplicate set as soon as it is known."""
+    # one pass: collect files and group by size (or name) as they are found
+    groups: dict[str, list[str]] = defaultdict(list)
+    size_map: dict[int, list[str]] = defaultdict(list)
+    for idx, (path, size) in enumerate(_scandir_recursive(str(root)), 1):
+        print(f"\rScanning {idx} files...", end="", flush=True)
+        if by == "name":
+            groups[os.path.basename(path)].append(path)
+        else:
+            size_map[size].append(path)
     print()
-
-    hashes: dict[str, list[Path]] = defaultdict(list)
-    work = [g for g in size_map.values() if len(g) > 1]
-    for group in work:
-        for p in group:
-            try:
-                digest = sha1sum(p)
-            except OSError as e:
-                print(f"Could not read {p}: {e}", file=sys.stderr)
-                continue
-            hashes[digest].append(p)
-    return {k: v for k, v in hashes.items() if len(v) > 1}
+    if by == "name":
+        for k, v in groups.items():
+            if len(v) > 1:
+                yield k, [Path(p) for p in v]
+        return
+
+    sized = [(size, g) for size, g in size_map.items() if len(g) > 1]
+    del size_map
+    total = len(sized)
+    # hashlib and read() release the GIL, so threads keep disk and cores busy
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as ex:
+        # size → head/tail fingerprint → full hash, like rdfind / fdupes.
+        # All probes are queued up front; each size group then queues its
+        # full hashes and is reported as soon as they finish.
+        probes = [[(p, ex.submit(quick_fingerprint, p, size)) for p in g]
+                  for size, g in sized]
+        pending: deque[list[tuple[str, Future]]] = deque()
+        for idx, jobs in enumerate(probes, 1):
+            print(f"\rHashing group {idx}/{total}...", end="", flush=True)
+            prints: dict[bytes, list[str]] = defaultdict(list)
+            for p, fut in jobs:
+                try:
+                    prints[fut.result()].append(p)
+                except OSError as e:
+                    print(f"\nCould not read {p}: {e}", file=sys.stderr)
+            probes[idx - 1] = None      # drop finished probe futures
+            pending.append([(p, ex.submit(hash_file, p))
+                            for g in prints.values() if len(g) > 1 for p in g])
+            while pending and all(f.done() for _, f in pending[0]):
+                yield from _collect(pending.popleft())
+        while pending:
+            yield from _collect(pending.popleft())
+    if total:
+        print()
 
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser(description="Detect duplicate audio files under a directory.")
     ap.add_argument("root", type=Path, help="Top-level folder to scan")
     ap.add_argument("--by", choices=["hash", "name"], default="hash",
-                    help="Compare files by SHA1 hash or file name")
+                    help="Compare files by content hash or file name")
     ap.add_argument("--version", action="version", version=VERSION_INFO)
     args = ap.parse_args()
     root = args.root.resolve()
     if not root.is_dir():
         sys.exit(f"{root} is not a directory")
-    dupes = find_dupes(root, by=args.by)
-    if not dupes:
-        print("No duplicates found.")
-    else:
-        for digest, files in dupes.items():
-            print(f"\nSHA1 {digest}")
+    log_file = root / DUP_LOG.name
+    label = f"{HASH_NAME} " if args.by == "hash" else ""
+    fh = None       # opened on the first hit, so a clean scan leaves no log
+    count = 0
+    try:
+        for key, files in find_dupes(root, by=args.by):
+            if fh is None:
+                fh = log_file.open("w", encoding="utf-8")
+            print(f"\n{label}{key}")
+            fh.write(f"{label}{key}\n")
             for f in files:
                 print(f"  {f}")
-        log_file = root / DUP_LOG.name
-        with log_file.open("w", encoding="utf-8") as fh:
-            for digest, files in dupes.items():
-                fh.write(f"SHA1 {digest}\n")
-                for f in files:
-                    fh.write(f"  {f}\n")
-                fh.write("\n")
-        print(f"\n{sum(len(v) for v in dupes.values())} duplicate files logged to {log_file}")
+                fh.write(f"  {f}\n")
+            fh.write("\n")
+            count += len(files)
+    finally:
+        if fh is not None:
+            fh.close()
+    if not count:
+        print("No duplicates found.")
+    else:
+        print(f"\n{count} duplicate files logged to {log_file}")
 
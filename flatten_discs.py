@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """
-ABtools/flatten_discs.py  –  v1.4  (2025-06-15)
+ABtools/flatten_discs.py  –  v1.10  (2026-10-15)
 
 Flatten audiobook rips that live in
     Book Name (Disc 01)  /  Book Name (Disc 02)  …
+    Book Name (1 of 5)   /  Book Name (2 of 5)   …
 creating one folder called  Book Name/Track 001.* …
 
 • Preview by default.  Add  --commit  to do it,  --yes  to skip prompts.
@@ -11,48 +12,64 @@ creating one folder called  Book Name/Track 001.* …
 """
 
 from __future__ import annotations
-import argparse, re, shutil, sys
+import argparse, errno, os, re, shutil, sys
 from pathlib import Path
 from typing import List, Tuple
 
-VERSION = "1.4"
+VERSION = "1.10"
 FILE_PATH = Path(__file__).resolve()
 VERSION_INFO = f"%(prog)s v{VERSION} ({FILE_PATH})"
 
+def _fast_move(src: Path, dst: Path) -> None:
+    """Single ``rename(2)`` on the same filesystem, ``shutil.move`` across."""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(src), str(dst))
+
 def safe_move(src: Path, dst: Path) -> None:
     """Move ``src`` to ``dst`` ensuring ``dst`` does not exist."""
     if dst.exists():
         raise FileExistsError(dst)
     dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.move(str(src), str(dst))
+    _fast_move(src, dst)
 
-AUDIO_EXTS = {".mp3", ".m4b", ".m4a", ".flac", ".ogg", ".opus"}
+AUDIO_EXTS = frozenset({".mp3", ".m4b", ".m4a", ".flac", ".ogg", ".opus"})
 
-# one-line regex that matches  Disc 01, disk-02, CD03, Part 4, etc.
-DISC_RX = re.compile(
-    r'(?:[\(\[\{]?)(?:disc|disk|cd|part)[\s_\-]*(?P<num>\d{1,3})(?:[\)\]\}]?)',
+# one regex for  Disc 01, disk-02, CD03, Part 4 (→ dnum)  and  (1 of 5), (3/5) (→ pnum)
+# so every folder name is scanned once; combobook.py imports it from here
+DISC_OR_PART_RX = re.compile(
+    r'(?:[\(\[\{]?(?:disc|disk|cd|part)[\s_\-]*(?P<dnum>\d{1,3})[\)\]\}]?)'
+    r'|(?:\((?P<pnum>\d{1,3})\s*(?:of|/)\s*\d{1,3}\))',
     re.IGNORECASE,
 )
 
 # ───────── helpers ────────────────────────────────────────────────────────────
 def is_audio(p: Path) -> bool:
-    return p.suffix.lower() in AUDIO_EXTS
+    name = p.name
+    i = name.rfind(".")
+    return i > 0 and name[i:].lower() in AUDIO_EXTS
+
+def _group_discs(folder: Path, dirnames: List[str]) -> List[Tuple[str, List[Tuple[int, Path]]]]:
+    """Group the already-listed sub-folder names of ``folder`` by book."""
+    groups: dict[str, List[Tuple[int, Path]]] = {}
+    for name in dirnames:
+        m = DISC_OR_PART_RX.search(name)
+        if not m:
+            continue
+        base = name[:m.start()].strip().rstrip(" -_")
+        groups.setdefault(base, []).append((int(m.group("dnum") or m.group("pnum")), folder / name))
+    return [(b, sorted(lst, key=lambda t: t[0])) for b, lst in groups.items()]
 
 def disc_sets_in(folder: Path) -> List[Tuple[str, List[Tuple[int, Path]]]]:
     """
     Return list of (base_name, [(disc_no, Path)…]) whose sub-dirs match *disk pattern*.
     Accepts even a single disc.
     """
-    groups: dict[str, List[Tuple[int, Path]]] = {}
-    for p in folder.iterdir():
-        if not p.is_dir():
-            continue
-        m = DISC_RX.search(p.name)
-        if not m:
-            continue
-        base = DISC_RX.split(p.name)[0].strip().rstrip(" -_")
-        groups.setdefault(base, []).append((int(m.group("num")), p))
-    return [(b, sorted(lst, key=lambda t: t[0])) for b, lst in groups.items()]
+    with os.scandir(folder) as it:
+        return _group_discs(folder, [e.name for e in it if e.is_dir()])
 
 def collect_tracks(discs: List[Tuple[int, Path]]) -> List[Path]:
     tracks: List[Path] = []
@@ -62,7 +79,8 @@ def collect_tracks(discs: List[Tuple[int, Path]]) -> List[Path]:
 
 def flatten(parent: Path, discs: List[Tuple[int, Path]],
             dry: bool, auto_yes: bool) -> bool:
-    base = DISC_RX.split(discs[0][1].name)[0].strip().rstrip(" -_")
+    name = discs[0][1].name
+    base = name[:DISC_OR_PART_RX.search(name).start()].strip().rstrip(" -_")
     book_dir = parent / base
     tracks   = collect_tracks(discs)
     if not tracks:
@@ -96,18 +114,15 @@ def flatten(parent: Path, discs: List[Tuple[int, Path]],
 def main(root: Path, commit: bool, auto_yes: bool):
     flattened = 0
 
-    # 1) look at ROOT itself
-    for base, discs in disc_sets_in(root):
-        if flatten(root, discs, dry=not commit, auto_yes=auto_yes):
-            flattened += 1
-
-    # 2) recurse
-    for folder in root.rglob("*"):
-        if not folder.is_dir():
-            continue
-        for base, discs in disc_sets_in(folder):
+    # one listing per folder, ROOT included; os.walk has already split out
+    # the sub-folder names, so grouping needs no second directory read
+    for dirpath, dirnames, _ in os.walk(root):
+        folder = Path(dirpath)
+        for base, discs in _group_discs(folder, dirnames):
             if flatten(folder, discs, dry=not commit, auto_yes=auto_yes):
                 flattened += 1
+                done = {d.name for _, d in discs}
+                dirnames[:] = [n for n in dirnames if n not in done]
 
     if flattened:
         print(f"\nFinished – {flattened} book(s) processed.")
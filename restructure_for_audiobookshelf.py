@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 """
-ABtools/restructure_for_audiobookshelf.py – v4.8  (2025-09-01)
+ABtools/restructure_for_audiobookshelf.py – v4.31  (2026-10-15)
 Use restructure_for_audiobookshelf.py "Source folder" "Destination folder" --commit 
 • Recursively scans source_root; every directory that *contains* audio but whose
   sub-directories don’t is treated as one “book”.
 • Reads tags with mutagen. If ``metadata.json`` or ``book.nfo`` files are
   present, those values are used as well. If tags are missing yet the folder
   name matches one of seven patterns (see REGEX_PATTERNS), injects minimal tags
-  with FFmpeg.
+  in place with mutagen (FFmpeg for containers mutagen cannot edit).
 • Flattens sub-folders named “Disc 01 / Disc-02 …” into the main folder and
   (optionally) renames every track sequentially: Track 001.*, Track 002.* …
 • Moves/renames into Audiobookshelf layout:
@@ -21,47 +21,134 @@ Use restructure_for_audiobookshelf.py "Source folder" "Destination folder" --com
 """
 
 from __future__ import annotations
-import argparse, errno, os, re, shutil, subprocess, sys, json
-from collections import defaultdict
-from dataclasses import dataclass
+import argparse, asyncio, contextlib, errno, functools, html, os, re, shutil, subprocess, sys, json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import List, Optional
 import xml.etree.ElementTree as ET
 
-VERSION = "4.8"
+VERSION = "4.31"
 FILE_PATH = Path(__file__).resolve()
 VERSION_INFO = f"%(prog)s v{VERSION} ({FILE_PATH})"
 
 # ───────── configuration ─────────
-AUDIO_EXTS: set[str]       = {".mp3", ".m4b", ".m4a", ".flac", ".ogg", ".opus"}
+AUDIO_EXTS: frozenset[str] = frozenset({".mp3", ".m4b", ".m4a", ".flac", ".ogg", ".opus"})
 RENAME_TRACKS              = True       # rename Track 001.* … inside each book?
-WRITE_TAGS_WITH_FFMPEG     = False        # inject minimal tags when using folder info
+WRITE_TAGS                 = False        # inject minimal tags when using folder info
 DISC_RX                    = re.compile(r"disc[ _-]?(\d+)", re.I)
+PREFETCH_WORKERS           = min(32, (os.cpu_count() or 1) * 4)
 
 try:
     from mutagen import File as MFile, MutagenError
+    from mutagen.easyid3 import EasyID3
+    from mutagen.easymp4 import EasyMP4Tags
 except ImportError:
     sys.exit("✗ mutagen not installed – run  'pip install mutagen'")
 
-FFMPEG = shutil.which("ffmpeg")
-if WRITE_TAGS_WITH_FFMPEG and not FFMPEG:
-    print("⚠️  FFmpeg not found – tag injection disabled.")
-    WRITE_TAGS_WITH_FFMPEG = False
+# only needed for containers mutagen cannot tag
+FFMPEG = shutil.which("ffmpeg") if WRITE_TAGS else None
+
+# let the easy interfaces read/write the series keys used in TAG_MAP
+for _key in ("series", "series-part"):
+    EasyID3.RegisterTXXXKey(_key, _key)
+    EasyMP4Tags.RegisterFreeformKey(_key, _key)
 
 # ───────── helpers ─────────
+# characters Windows / Audiobookshelf won't accept in a folder name
+_SLUG_TBL = str.maketrans("", "", '<>:"/\\|?*' + "".join(map(chr, range(32))))
+
+@functools.lru_cache(maxsize=4096)   # books share authors and series
 def slug(txt: str) -> str:
-    txt = re.sub(r'[<>:"/\\|?*\x00-\x1F]', "", txt).strip()
-    return txt.rstrip(" .")
+    return txt.translate(_SLUG_TBL).strip().rstrip(" .")
+
+def _audio(name: str) -> bool:
+    """Suffix test on a bare file name, without building a ``Path``."""
+    i = name.rfind(".")
+    return i > 0 and name[i:].lower() in AUDIO_EXTS
 
 def has_audio(d: Path) -> bool:
-    return any(p.suffix.lower() in AUDIO_EXTS for p in d.iterdir())
+    with os.scandir(d) as it:       # stops at the first audio file
+        return any(_audio(e.name) for e in it if e.is_file(follow_symlinks=False))
+
+def _scan(path: str, leaves: List[Path]) -> bool:
+    """Walk ``path`` once with scandir, appending leaf-audio dirs to ``leaves``.
+
+    Returns whether ``path`` itself holds audio, so the caller can tell if
+    one of its direct children does.
+    """
+    here = False
+    subdirs: list[str] = []
+    try:
+        it = os.scandir(path)
+    except OSError as e:
+        print(f"  ! cannot read {path}: {e}")
+        return False
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif not here:
+                here = _audio(entry.name)
+    child_audio = False
+    for sub in subdirs:
+        child_audio |= _scan(sub, leaves)
+    if here and not child_audio:
+        leaves.append(Path(path))
+    return here
 
 def leaf_audio_dirs(root: Path) -> List[Path]:
-    return [
-        p for p in root.rglob("*")
-        if p.is_dir() and has_audio(p)
-        and not any(c.is_dir() and has_audio(c) for c in p.iterdir())
-    ]
+    """Directories with audio but no direct sub-directory holding audio."""
+    leaves: List[Path] = []
+    _scan(str(root), leaves)
+    return [p for p in leaves if p != root]
+
+# copy-on-write clones: instant on APFS / btrfs / XFS, plain copy elsewhere
+_clonefile = None
+if sys.platform == "darwin":
+    try:
+        import ctypes
+        _clonefile = ctypes.CDLL(None, use_errno=True).clonefile
+        _clonefile.argtypes = (ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32)
+    except (OSError, AttributeError):
+        _clonefile = None
+_NO_CLONE = {errno.EXDEV, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EINVAL,
+             errno.ENOSYS, errno.EBADF, errno.EPERM}
+
+def _clone_file(src: str, dst: str) -> None:
+    """Copy one file, letting the filesystem share blocks where it can."""
+    if _clonefile is not None:
+        if _clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return
+    elif hasattr(os, "copy_file_range"):
+        # Linux: in-kernel copy, which btrfs / XFS (reflink=1) turn into a clone
+        try:
+            with open(src, "rb") as fi, open(dst, "wb") as fo:
+                left = os.fstat(fi.fileno()).st_size
+                while left > 0:
+                    n = os.copy_file_range(fi.fileno(), fo.fileno(), left)
+                    if n == 0:
+                        break
+                    left -= n
+            if left <= 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError as e:
+            if e.errno not in _NO_CLONE:
+                raise
+    shutil.copy2(src, dst)
+
+def _clone_tree(src: str, dst: str) -> None:
+    """``shutil.copytree`` built on :func:`_clone_file`."""
+    os.mkdir(dst)
+    with os.scandir(src) as it:
+        for entry in it:
+            target = os.path.join(dst, entry.name)
+            if entry.is_dir():
+                _clone_tree(entry.path, target)
+            else:
+                _clone_file(entry.path, target)
+    shutil.copystat(src, dst)
 
 def safe_move(src: Path, dst: Path, copy: bool = False) -> None:
     """Move ``src`` to ``dst`` (or copy when ``copy`` is True) and ensure
@@ -71,22 +158,25 @@ def safe_move(src: Path, dst: Path, copy: bool = False) -> None:
     dst.parent.mkdir(parents=True, exist_ok=True)
     if copy:
         if src.is_dir():
-            shutil.copytree(str(src), str(dst))
+            _clone_tree(str(src), str(dst))
         else:
-            shutil.copy2(str(src), str(dst))
+            _clone_file(str(src), str(dst))
         return
     try:
-        shutil.move(str(src), str(dst))
+        if os.stat(src).st_dev == os.stat(dst.parent).st_dev:
+            os.replace(src, dst)        # same filesystem: one atomic rename
+        else:
+            shutil.move(str(src), str(dst))
     except (PermissionError, OSError) as e:
         # Windows “access denied / file in use” or cross-device rename → copy
         if isinstance(e, OSError) and e.errno not in (errno.EXDEV, errno.EACCES):
             raise
         print("  ! rename failed – copying …")
         if src.is_dir():
-            shutil.copytree(str(src), str(dst))
+            _clone_tree(str(src), str(dst))
             shutil.rmtree(src)
         else:
-            shutil.copy2(str(src), str(dst))
+            _clone_file(str(src), str(dst))
             src.unlink()
 
 # ───────── fuzzy series helpers ─────────
@@ -149,8 +239,18 @@ TAG_MAP = {
 }
 
 def read_tags(track: Path) -> Optional[BookMeta]:
+    """Tag metadata of ``track``; re-parsed only when the file changes."""
     try:
-        audio = MFile(str(track), easy=True)
+        st = os.stat(track)
+    except OSError:
+        return None
+    meta = _read_tags_cached(str(track), st.st_mtime_ns, st.st_size)
+    return replace(meta) if meta else None   # merge_meta mutates its input
+
+@functools.lru_cache(maxsize=1024)
+def _read_tags_cached(path: str, mtime_ns: int, size: int) -> Optional[BookMeta]:
+    try:
+        audio = MFile(path, easy=True)
     except MutagenError:
         return None
     if not audio:
@@ -162,19 +262,39 @@ def read_tags(track: Path) -> Optional[BookMeta]:
     seq  = m["seq"].split("/")[0] if m["seq"] and "/" in m["seq"] else m["seq"]
     yr   = m["year"][:4] if m["year"] else None
     return BookMeta(m["author"] or "Unknown Author", m["series"], seq, yr,
-                    m["title"] or track.stem, m["narr"])
+                    m["title"] or Path(path).stem, m["narr"])
 
-def read_nfo(folder: Path) -> Optional[BookMeta]:
-    nfo = folder / "book.nfo"
-    if not nfo.is_file():
-        return None
+# book.nfo is flat and has a fixed set of fields, so one regex replaces a DOM
+_NFO_RX = re.compile(r"<(author|series|seq|year|title|narr)>\s*([^<]*?)\s*</\1>",
+                     re.I | re.S)
+
+def _nfo_fields_et(nfo: Path) -> Optional[dict[str, str]]:
     try:
         root = ET.parse(str(nfo)).getroot()
     except ET.ParseError:
         return None
+    out = {}
+    for el in root:
+        if el.text and el.text.strip():
+            out.setdefault(el.tag, el.text.strip())
+    return out
+
+def read_nfo(folder: Path) -> Optional[BookMeta]:
+    nfo = folder / "book.nfo"
+    try:
+        data = nfo.read_text(encoding="utf-8", errors="replace")
+    except OSError:         # missing, or not a file
+        return None
+    fields: dict[str, str] = {}
+    for m in _NFO_RX.finditer(data):
+        if m.group(2):
+            fields.setdefault(m.group(1).lower(), html.unescape(m.group(2)))
+    if not fields:          # CDATA, odd layout … let the XML parser try
+        fields = _nfo_fields_et(nfo)
+        if fields is None:
+            return None
     def txt(tag: str) -> Optional[str]:
-        el = root.find(tag)
-        return el.text.strip() if el is not None and el.text else None
+        return fields.get(tag) or None
     meta = BookMeta(
         author=txt("author") or "Unknown Author",
         series=txt("series"),
@@ -255,6 +375,50 @@ REGEX_PATTERNS: list[re.Pattern[str]] = [
         ^\s*(?P<author>.+?)\s*\\\[\s*(?P<year>\d{4})]\s*
         (?P<title>.+?)\s*$""", re.VERBOSE),
 ]
+# All seven as one alternation, so a folder name costs a single match() call.
+# Branch X wraps pattern X and its groups become X_author, X_title …; the
+# wrapper closes last, so ``m.lastgroup`` names the branch that matched.
+# Alternatives are tried left to right, so the first pattern still wins.
+PATTERN_TAGS = "ABCDEFG"
+_BRANCHES = {
+    tag: f"(?P<{tag}>" + re.sub(r"\(\?P<(\w+)>", rf"(?P<{tag}_\1>", rx.pattern) + ")"
+    for tag, rx in zip(PATTERN_TAGS, REGEX_PATTERNS)
+}
+
+@functools.lru_cache(maxsize=None)
+def _fused_rx(tags: str) -> re.Pattern[str]:
+    """Alternation of the patterns named in ``tags``, in REGEX_PATTERNS order."""
+    return re.compile("|".join(_BRANCHES[t] for t in tags), re.VERBOSE)
+
+FUSED_RX = _fused_rx(PATTERN_TAGS)
+_FUSED_GROUPS = {
+    tag: [(k, k[2:]) for k in FUSED_RX.groupindex if k.startswith(tag + "_")]
+    for tag in PATTERN_TAGS
+}
+
+# Literal text each pattern cannot match without. Checking these with plain
+# str operations drops impossible branches before the regex engine runs;
+# the survivors keep their order, so the same pattern wins.
+_REQUIRES = {
+    "A": {"-", "2-"},               # Author - … - Title  (two dashes)
+    "B": {"-", "[", "]"},           # Title [Series -#] - Author
+    "C": {"-", "\\[", "]"},         # Series - Author\[YYYY] Title
+    "D": {"^[", "]"},               # [YYYY] Title
+    "E": {"-", "(", ")"},           # Author - Title (YYYY)
+    "F": {"-", "(", ")"},           # Title - Author (YYYY)
+    "G": {"\\[", "]"},              # Author\[YYYY] Title
+}
+
+def _candidate_tags(name: str) -> str:
+    have = {c for c in "-[]()" if c in name}
+    if name.count("-") > 1:
+        have.add("2-")
+    if "\\[" in name:
+        have.add("\\[")
+    if name.lstrip().startswith("["):
+        have.add("^[")
+    return "".join(t for t in PATTERN_TAGS if _REQUIRES[t] <= have)
+
 CLEAN_TAIL_RX = re.compile(
     r"""                      # strip from the right end:
         (?:\s*\((?!(?:\d+\s*of\s*\d+|[Pp]art\s*\d+))[^)]*\))?  #  (Lee) but keep (1 of 6) / (Part 1)
@@ -265,9 +429,16 @@ CLEAN_TAIL_RX = re.compile(
     """,
     re.VERBOSE,
 )
+def _may_have_tail(raw: str) -> bool:
+    # every tail CLEAN_TAIL_RX removes ends in ) } k K, a digit or whitespace;
+    # otherwise the (slow, try-every-offset) substitution cannot change anything
+    last = raw[-1:]
+    return last in (")", "}", "k", "K") or last.isdigit() or last.isspace()
+
 def clean_title(raw: str, year: str | None) -> str:
     """Return title without bitrate / size / duration tails."""
-    txt = CLEAN_TAIL_RX.sub("", raw).strip()
+    txt = CLEAN_TAIL_RX.sub("", raw) if _may_have_tail(raw) else raw
+    txt = txt.strip()
     # if it still starts with 'YYYY -', drop it (already stored in meta.year)
     if year and txt.startswith(year):
         after = txt[len(year):].lstrip(" -")
@@ -275,35 +446,106 @@ def clean_title(raw: str, year: str | None) -> str:
     return txt
 
 
-def parse_folder(folder: Path) -> Optional[BookMeta]:
-    name = folder.name
-    for rx in REGEX_PATTERNS:
-        m = rx.match(name)
-        if not m:
-            continue
-        g = {k: (v.strip() if v else v) for k, v in m.groupdict().items()}
-        # Pattern D needs author/series from parent if available
-        if rx is REGEX_PATTERNS[3] and folder.parent != folder:
-            parent = parse_folder(folder.parent)
-            if parent:
-                g.setdefault("author", parent.author)
-                g.setdefault("series", parent.series)
-        cleaned_title = clean_title(g.get("title") or name, g.get("year"))
-        return BookMeta(
-            g.get("author") or "Unknown Author",
-            g.get("series"),
-            g.get("seq"),
-            g.get("year"),
-            cleaned_title,
-            g.get("narr"),
-        )
-        
-    return None
+@functools.lru_cache(maxsize=4096)
+def _parse_name(name: str) -> Optional[tuple[int, BookMeta]]:
+    """Match ``name`` against REGEX_PATTERNS; return (pattern index, meta).
 
-def inject_tags(track: Path, meta: BookMeta, index: int = 0, total: int = 0):
-    if not (WRITE_TAGS_WITH_FFMPEG and FFMPEG):
-        return
-    tmp = track.with_suffix(track.suffix + ".tmp")
+    Pure function of the folder name, so sibling books that share a parent
+    only parse that parent once. Callers must copy the cached meta.
+    """
+    tags = _candidate_tags(name)
+    m = _fused_rx(tags).match(name) if tags else None
+    if not m:
+        return None
+    tag = m.lastgroup
+    g = {short: m.group(full) for full, short in _FUSED_GROUPS[tag]}
+    g = {k: (v.strip() if v else v) for k, v in g.items()}
+    return PATTERN_TAGS.index(tag), BookMeta(
+        g.get("author") or "Unknown Author",
+        g.get("series"),
+        g.get("seq"),
+        g.get("year"),
+        clean_title(g.get("title") or name, g.get("year")),
+        g.get("narr"),
+    )
+
+# pattern-D folders already resolved against their ancestors, by path
+_RESOLVED: dict[Path, BookMeta] = {}
+_MISSING = object()
+
+def parse_folder(folder: Path) -> Optional[BookMeta]:
+    hit = _parse_name(folder.name)
+    if not hit:
+        return None
+    idx, meta = hit
+    if idx != 3:
+        return replace(meta)
+    # Pattern D needs author/series from the parent, which may itself be a
+    # pattern-D folder: climb until a folder that isn't (or a cached one) …
+    chain: list[tuple[Path, BookMeta]] = []
+    base: Optional[BookMeta] = None
+    f, cur = folder, meta
+    while True:
+        cached = _RESOLVED.get(f, _MISSING)
+        if cached is not _MISSING:
+            base = cached
+            break
+        chain.append((f, cur))
+        parent = f.parent
+        if parent == f:
+            break
+        hit = _parse_name(parent.name)
+        if not hit:
+            break
+        if hit[0] != 3:
+            base = hit[1]
+            break
+        f, cur = parent, hit[1]
+    # … then hand author/series back down the chain, caching each level
+    for f, cur in reversed(chain):
+        cur = replace(cur)
+        if base:
+            cur.author = base.author
+            cur.series = base.series
+        _RESOLVED[f] = cur
+        base = cur
+    return replace(base)
+
+TAG_PADDING = 8192
+
+def _padding(info) -> int:
+    """Reserve 8 KiB of tag padding on the first save, then keep what is left."""
+    return info.padding if info.padding > 0 else TAG_PADDING
+
+def _mutagen_inject(track: Path, meta: BookMeta, index: int, total: int) -> bool:
+    """Patch the tag block in place; False if mutagen can't edit this file."""
+    try:
+        audio = MFile(str(track), easy=True)
+        if audio is None:
+            return False
+        if audio.tags is None:
+            audio.add_tags()
+        audio["artist"] = meta.author
+        audio["albumartist"] = meta.author
+        audio["album"] = meta.title
+        audio["title"] = track.stem
+        if meta.year:
+            audio["date"] = meta.year
+        if meta.narr:
+            audio["composer"] = meta.narr
+        if meta.series:
+            audio["series"] = meta.series
+            if meta.seq:
+                audio["series-part"] = meta.seq
+        if index:
+            audio["tracknumber"] = f"{index}/{total or index}"
+        audio.save(padding=_padding)
+    except (MutagenError, KeyError, ValueError):
+        return False
+    return True
+
+def _inject_cmd(track: Path, tmp: Path, meta: BookMeta,
+                index: int = 0, total: int = 0) -> List[str]:
     cmd = [
         FFMPEG, "-nostdin", "-loglevel", "error", "-y",
         "-i", str(track), "-codec", "copy",
@@ -322,67 +564,147 @@ def inject_tags(track: Path, meta: BookMeta, index: int = 0, total: int = 0):
     if index:
         cmd += ["-metadata", f"track={index}/{total or index}"]
     cmd.append(str(tmp))
-    if subprocess.run(cmd, stdout=subprocess.DEVNULL,
-                      stderr=subprocess.DEVNULL).returncode == 0 and tmp.exists():
+    return cmd
+
+async def _inject_tags(track: Path, meta: BookMeta, index: int, total: int,
+                       sem: asyncio.Semaphore) -> None:
+    # keep the real extension last so FFmpeg can pick the output muxer
+    tmp = track.with_name(f"{track.stem}.tmp{track.suffix}")
+    async with sem:
+        proc = await asyncio.create_subprocess_exec(
+            *_inject_cmd(track, tmp, meta, index, total),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        rc = await proc.wait()
+    if rc == 0 and tmp.exists():
         tmp.replace(track)
+    elif tmp.exists():
+        tmp.unlink()
+
+def inject_tags(tracks: List[Path], meta: BookMeta) -> None:
+    """Tag every track with mutagen; hand the rest to FFmpeg.
+
+    FFmpeg runs once per left-over track, at most one per CPU at a time.
+    """
+    if not WRITE_TAGS or not tracks:
+        return
+    total = len(tracks)
+    rest = [(i, t) for i, t in enumerate(tracks, 1)
+            if not _mutagen_inject(t, meta, i, total)]
+    if not rest or not FFMPEG:
+        return
+    async def run():
+        sem = asyncio.Semaphore(os.cpu_count() or 1)   # must live in this loop
+        await asyncio.gather(*(_inject_tags(t, meta, i, total, sem) for i, t in rest))
+    asyncio.run(run())
 
 # ───────── disc-flattener ─────────
+def _ext(name: str) -> str:
+    return name[name.rfind("."):].lower()
+
+def _audio_names(folder: str) -> List[str]:
+    with os.scandir(folder) as it:
+        return sorted(e.name for e in it if _audio(e.name))
+
 def flatten_discs(book_dir: Path, dry: bool):
-    discs = sorted(
-        [(int(m.group(1)), p) for p in book_dir.iterdir() if p.is_dir()
-         for m in [DISC_RX.search(p.name)] if m],
-        key=lambda t: t[0]
-    )
+    # one listing sorts entries into disc folders and top-level tracks
+    discs: list[tuple[int, str]] = []
+    top: list[str] = []
+    with os.scandir(book_dir) as it:
+        for e in it:
+            if e.is_dir():
+                m = DISC_RX.search(e.name)
+                if m:
+                    discs.append((int(m.group(1)), e.path))
+            elif _audio(e.name):
+                top.append(e.name)
     if not discs:
         return
-    top_tracks = sorted(p for p in book_dir.iterdir() if p.suffix.lower() in AUDIO_EXTS)
-    tracks: list[Path] = top_tracks + [
-        t for _, d in discs
-        for t in sorted(p for p in d.iterdir() if p.suffix.lower() in AUDIO_EXTS)
+    discs.sort(key=lambda t: t[0])
+    base = str(book_dir)
+    tracks: list[tuple[str, str]] = [(base, n) for n in sorted(top)] + [
+        (d, n) for _, d in discs for n in _audio_names(d)
     ]
     digits = len(str(len(tracks)))
     print(f"  · Flattening {len(discs)} disc folders → {len(tracks)} tracks")
-    for idx, p in enumerate(tracks, 1):
-        new = book_dir / f"Track {idx:0{digits}d}{p.suffix.lower()}"
-        if p != new:
-            print(f"    {'mv' if not dry else '↪'} {p.name} → {new.name}")
-            if not dry:
-                safe_move(p, new)
+    for idx, (folder, name) in enumerate(tracks, 1):
+        new_name = f"Track {idx:0{digits}d}{_ext(name)}"
+        if folder == base and name == new_name:
+            continue
+        print(f"    {'mv' if not dry else '↪'} {name} → {new_name}")
+        if not dry:
+            new = os.path.join(base, new_name)
+            if os.path.lexists(new):
+                raise FileExistsError(new)
+            os.rename(os.path.join(folder, name), new)
     if not dry:
         for _, d in discs:
-            try: d.rmdir()
+            try: os.rmdir(d)
             except OSError: pass
 
 def rename_tracks(folder: Path):
     if not RENAME_TRACKS:
         return
-    tracks = sorted(p for p in folder.iterdir()
-                    if p.suffix.lower() in AUDIO_EXTS)
-    digits = len(str(len(tracks)))
-    tmp_files: list[Path] = []
+    base = str(folder)
+    names = _audio_names(base)
+    digits = len(str(len(names)))
+    tmp_names: list[str] = []
     # first rename to temporary names to avoid collisions
-    for idx, p in enumerate(tracks):
-        tmp = folder / f".tmp_{idx:0{digits}d}{p.suffix.lower()}"
-        p.rename(tmp)
-        tmp_files.append(tmp)
+    for idx, name in enumerate(names):
+        tmp = f".tmp_{idx:0{digits}d}{_ext(name)}"
+        os.rename(os.path.join(base, name), os.path.join(base, tmp))
+        tmp_names.append(tmp)
     # now rename sequentially to final names
-    for i, tmp in enumerate(tmp_files, 1):
-        final = folder / f"Track {i:0{digits}d}{tmp.suffix.lower()}"
-        tmp.rename(final)
+    for i, tmp in enumerate(tmp_names, 1):
+        os.rename(os.path.join(base, tmp),
+                  os.path.join(base, f"Track {i:0{digits}d}{_ext(tmp)}"))
+
+# ───────── run counters ─────────
+@dataclass
+class Stats:
+    total: int = 0
+    moved: int = 0
+    would_move: int = 0
+    exists: int = 0
+    no_audio: int = 0
+    tag_fail: int = 0
+
+# ───────── read-only scan of one book ─────────
+@dataclass
+class BookScan:
+    first: Optional[Path]           # first audio file, None if there is none
+    tags_meta: Optional[BookMeta] = None
+    json_meta: Optional[BookMeta] = None
+    nfo_meta: Optional[BookMeta] = None
+    folder_meta: Optional[BookMeta] = None
+
+def _prefetch(book: Path) -> BookScan:
+    """Do all of a book's metadata reads; safe to run on a worker thread."""
+    first = next((p for p in book.iterdir() if _audio(p.name)), None)
+    if not first:
+        return BookScan(None)
+    return BookScan(first, read_tags(first), read_json(book), read_nfo(book),
+                    parse_folder(book))
 
 # ───────── process one book ─────────
-def process(book: Path, library: Path, dry: bool, copy: bool, st: defaultdict,
-            interactive: bool = False):
-    st["total"] += 1
-    first = next((p for p in book.iterdir() if p.suffix.lower() in AUDIO_EXTS), None)
+def process(book: Path, library: Path, dry: bool, copy: bool, st: Stats,
+            interactive: bool = False, scan: Optional[BookScan] = None):
+    st.total += 1
+    if scan is None:
+        scan = _prefetch(book)
+    first = scan.first
     if not first:
         print("• Skipping (no audio):", book)
-        st["no_audio"] += 1
+        st.no_audio += 1
         return
 
-    meta = merge_meta(read_tags(first), read_json(book))
-    meta = merge_meta(meta, read_nfo(book))
-    meta = merge_meta(meta, parse_folder(book))
+    # each source is read once; the results also drive the messages and
+    # the tag-injection guard below
+    tags_meta = scan.tags_meta
+    json_meta = scan.json_meta
+    nfo_meta  = scan.nfo_meta
+    meta = merge_meta(tags_meta, json_meta)
+    meta = merge_meta(meta, nfo_meta)
+    meta = merge_meta(meta, scan.folder_meta)
     if not meta or not meta.series or not meta.seq:
         fs, fq = fuzzy_series(book.name)
         if fs and (not meta or not meta.series):
@@ -405,7 +727,7 @@ def process(book: Path, library: Path, dry: bool, copy: bool, st: defaultdict,
             narr=None,
         )
         print(f"  · No metadata found: using folder name “{meta.title}”")
-    elif not read_tags(first):
+    elif tags_meta is None:
         print(f"  · Tags missing – derived metadata “{meta.title}”")
 
     if interactive and (not meta.series or not meta.seq):
@@ -421,11 +743,10 @@ def process(book: Path, library: Path, dry: bool, copy: bool, st: defaultdict,
     
 
     # inject tags when original files lacked metadata
-    if (WRITE_TAGS_WITH_FFMPEG and not dry and not read_tags(first)
-            and not read_json(book) and not read_nfo(book)):
-        tracks = sorted(p for p in book.iterdir() if p.suffix.lower() in AUDIO_EXTS)
-        for idx, t in enumerate(tracks, 1):
-            inject_tags(t, meta, idx, len(tracks))
+    if (WRITE_TAGS and not dry and tags_meta is None
+            and json_meta is None and nfo_meta is None):
+        tracks = sorted(p for p in book.iterdir() if _audio(p.name))
+        inject_tags(tracks, meta)
 
     author_dir = slug(meta.author)
     title_parts = [
@@ -436,14 +757,12 @@ def process(book: Path, library: Path, dry: bool, copy: bool, st: defaultdict,
     ]
     title_dir = slug(" - ".join(p for p in title_parts if p))
 
-    dest = library / author_dir
-    if meta.series:
-        dest /= slug(meta.series)
-    dest /= title_dir
+    series_dir = slug(meta.series) if meta.series else ""
+    dest = Path(os.path.join(library, author_dir, series_dir, title_dir))
 
     if dest.exists():
         print("• Destination exists, skipping:", dest)
-        st["exists"] += 1
+        st.exists += 1
         return
 
     action = 'cp' if copy else 'mv'
@@ -452,38 +771,64 @@ def process(book: Path, library: Path, dry: bool, copy: bool, st: defaultdict,
         flatten_discs(book, dry=True)
         if RENAME_TRACKS:
             rename_tracks(book)
-        st["would_move"] += 1
+        st.would_move += 1
         return
 
     safe_move(book, dest, copy=copy)
     flatten_discs(dest, dry=False)
     if RENAME_TRACKS:
         rename_tracks(dest)
-    st["moved"] += 1
+    st.moved += 1
 
 # ───────── main driver ─────────
+@contextlib.contextmanager
+def _buffered_stdout():
+    """Turn off line buffering on a console stdout; the caller flushes.
+
+    A dry run prints a few lines per book, and on a terminal (Windows in
+    particular) every line is otherwise its own write.  ``input()`` flushes
+    stdout itself, so --interactive prompts still appear in time.
+    """
+    out = sys.stdout
+    line = getattr(out, "line_buffering", False) and hasattr(out, "reconfigure")
+    if line:
+        out.reconfigure(line_buffering=False)
+    try:
+        yield out
+    finally:
+        out.flush()
+        if line:
+            out.reconfigure(line_buffering=True)
+
 def main(src: Path, library: Path, commit: bool, copy: bool, interactive: bool):
     if not src.is_dir():
         sys.exit(f"✗ Source folder not found: {src}")
 
-    stats: defaultdict[str, int] = defaultdict(int)
-    for bd in leaf_audio_dirs(src):
-        process(bd, library, dry=not commit, copy=copy, st=stats,
-                interactive=interactive)
+    stats = Stats()
+    books = leaf_audio_dirs(src)
+    # tag/json/nfo reads are I/O bound and run ahead on worker threads;
+    # prints, prompts and moves stay on this thread, in order
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as ex, \
+            _buffered_stdout() as out:
+        for bd, scan in zip(books, ex.map(_prefetch, books)):
+            process(bd, library, dry=not commit, copy=copy, st=stats,
+                    interactive=interactive, scan=scan)
+            out.flush()                 # one write per book
 
     print("\n──── Summary ────")
-    print(f" Books scanned            : {stats['total']}")
+    print(f" Books scanned            : {stats.total}")
     action_word = 'copied' if copy else 'moved'
-    print(f" Books {action_word:20}: {stats['moved']}")
+    print(f" Books {action_word:20}: {stats.moved}")
     if not commit:
-        print(f" Books that would move    : {stats['would_move']}")
+        print(f" Books that would move    : {stats.would_move}")
     for k, label in (
         ("exists", "Destination exists"),
         ("no_audio", "No audio"),
         ("tag_fail", "Tag/name unreadable"),
     ):
-        if stats[k]:
-            print(f" {label:25}: {stats[k]}")
+        n = getattr(stats, k)
+        if n:
+            print(f" {label:25}: {n}")
     print("──── Done ────\n")
 
 # ───────── CLI entry ─────────
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-ABtools/search_and_tag.py – v2.15  (2025-09-01)
+ABtools/search_and_tag.py – v2.44  (2026-10-15)
 Tag (or strip) audiobook files using multiple metadata providers.
 
     The script queries Audible, Open Library and Google Books, ranks the
@@ -28,12 +28,12 @@ python search_and_tag.py "E:\\Audio Books" --recurse --striptags --commit
 """
 
 from __future__ import annotations
-import argparse, datetime, re, sys, textwrap
+import argparse, atexit, functools, html, os, re, shelve, sys, textwrap, threading, time
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import NamedTuple, Optional, Tuple, List, TextIO
 from abclient import AbClient
 
-VERSION = "2.15"
+VERSION = "2.44"
 FILE_PATH = Path(__file__).resolve()
 VERSION_INFO = f"%(prog)s v{VERSION} ({FILE_PATH})"
 
@@ -41,64 +41,142 @@ DEBUG = False
 AB = AbClient()
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from concurrent.futures import ThreadPoolExecutor, as_completed
+# one keep-alive pool per host shared by every leaf and provider thread.
+# At most HOST_CONNS sockets per host: extra requests wait for a free
+# connection (pool_block) instead of opening one-off sockets that the
+# pool would throw away.  Rate limits and 5xx hiccups are retried with a
+# short backoff.
+HOST_CONNS = 8
 SESSION = requests.Session()
-from rapidfuzz import fuzz
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16, pool_maxsize=HOST_CONNS, pool_block=True,
+    max_retries=Retry(total=2, backoff_factor=0.3,
+                      status_forcelist=[429, 500, 502, 503, 504]),
+))
+SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+from rapidfuzz import fuzz, process, utils
 import json
+try:  # C parser / writer for lookup responses, cache entries and metadata.json
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    json_loads = json.loads
 import xml.etree.ElementTree as ET
 from mutagen import File as MFile, MutagenError
 from mutagen.id3 import ID3, ID3NoHeaderError, TIT2, TALB, TPE1, TDRC, TXXX, TRCK
 from mutagen.mp4 import MP4, MP4StreamInfoError
-from bs4 import BeautifulSoup
 
 # ───── colour (rich) or plain text ─────
 try:
     from rich import print as rprint
     from rich.prompt import Confirm
+    _confirm = Confirm.ask
 except ImportError:  # plain console, strip tags like [bold]…[/]
     _TAGS = re.compile(r"\[/?[a-zA-Z].*?]")
     def rprint(*a, **k): print(_TAGS.sub("", " ".join(map(str, a))), **k)
     def Confirm(prompt: str, default=False):
         ans = input(f"{prompt} [{'Y/n' if default else 'y/N'}] ").lower().strip()
         return default if ans == "" else ans in {"y", "yes"}
+    _confirm = Confirm
+
+# leaves tagged in parallel print their block in one go, not line by line
+_OUT = threading.local()
+_OUT_LOCK = threading.Lock()
+
+def say(*a, **k):
+    buf = getattr(_OUT, "lines", None)
+    if buf is None:
+        rprint(*a, **k)
+    else:
+        buf.append((a, k))
+
+def _flush_said():
+    lines, _OUT.lines = _OUT.lines, None
+    with _OUT_LOCK:
+        for a, k in lines:
+            rprint(*a, **k)
 
 # ───── constants ─────
 AUDIO_EXTS = {".mp3", ".m4a", ".m4b"}
 TAIL_RX    = re.compile(r"(?:\{[^}]*\})?(?:\s*\d+\.\d{2}\.\d{2})?(?:\s*\d+\s*[kK])?\s*$")
 PAREN_RX   = re.compile(r"\([^)]*\)")
 YEAR_RX    = re.compile(r"^(\d{4})\s*[-_]\s*")
+DIGIT_ONLY = re.compile(r"\d+\Z")
+YEAR_ONLY  = re.compile(r"\d{4}\Z")
 LOG_PATH   = Path("tag_log.txt")
 REVIEW_PATH = Path("review_log.txt")
+CACHE_PATH: Optional[Path] = None   # set by main(); None keeps lookups in memory only
+CACHE_TTL  = 30 * 86400             # seconds a provider answer stays fresh
+CACHE_FORMAT = 2                    # bump when provider answers change shape
+LEAF_WORKERS = min(16, (os.cpu_count() or 1) * 4)   # leaves tagged at once (--yes/--no/--striptags)
+TAG_WORKERS = 4                     # files of one book tagged at once
 
 # ───── logging helper ─────
+# each log file is opened once (line-buffered) and closed at exit
+_LOG_FH: dict[Path, TextIO] = {}
+
+def _append(target: Path, line: str):
+    with _OUT_LOCK:
+        fh = _LOG_FH.get(target)
+        if fh is None:
+            target.parent.mkdir(exist_ok=True)
+            fh = _LOG_FH[target] = target.open("a", encoding="utf-8", buffering=1)
+        fh.write(line)
+
+@atexit.register
+def _close_logs():
+    for fh in _LOG_FH.values():
+        fh.close()
+    _LOG_FH.clear()
+
+# log lines in the same second share one formatted timestamp; the pair is
+# swapped in as a whole, so threads never see a half-updated one
+_STAMP: Tuple[int, str] = (0, "")
+
+def _ts() -> str:
+    global _STAMP
+    now, stamp = int(time.time()), _STAMP
+    if now != stamp[0]:
+        stamp = _STAMP = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+    return stamp[1]
+
 def log(status: str, message: str):
-    LOG_PATH.parent.mkdir(exist_ok=True)
-    with LOG_PATH.open("a", encoding="utf-8") as fh:
-        fh.write(f"{datetime.datetime.now():%F %T}  {status:<7}  {message}\n")
+    _append(LOG_PATH, f"{_ts()}  {status:<7}  {message}\n")
 
 def review_log(path: Path, reason: str):
-    REVIEW_PATH.parent.mkdir(exist_ok=True)
-    with REVIEW_PATH.open("a", encoding="utf-8") as fh:
-        fh.write(f"{datetime.datetime.now():%F %T}  {reason:<9}  {path}\n")
+    _append(REVIEW_PATH, f"{_ts()}  {reason:<9}  {path}\n")
 
 # ───── tiny helpers ─────
 def clean_tail(s: str) -> str:
     return TAIL_RX.sub("", s).strip()
 
+def _audio(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in AUDIO_EXTS
+
 def has_audio(folder: Path) -> bool:
-    return any(c.suffix.lower() in AUDIO_EXTS for c in folder.iterdir())
+    with os.scandir(folder) as it:
+        return any(_audio(e.name) for e in it)
 
 # ───── filename guess ─────
 def guess_from_path(p: Path) -> Tuple[Optional[str], str, Optional[str]]:
     """Return (author, title, year).  Author may be None."""
-    leaf = clean_tail(p.stem if p.is_file() else p.name)
+    return _guess(p.stem if p.is_file() else p.name, p.parent.name)
+
+@functools.lru_cache(maxsize=65536)
+def _guess(name: str, parent_name: str) -> Tuple[Optional[str], str, Optional[str]]:
+    """guess_from_path() on the two names it reads; same names, same answer."""
+    leaf = clean_tail(name)
     year = None
     if (m := YEAR_RX.match(leaf)):
         year, leaf = m.group(1), leaf[m.end():].lstrip(" -_")
     parts = [x.strip() for x in leaf.split(" - ")]
-    if parts and re.fullmatch(r"\d+", parts[0]):
+    if parts and DIGIT_ONLY.match(parts[0]):
         parts = parts[1:]
-    if parts and re.fullmatch(r"\d{4}", parts[-1]) and year is None:
+    if parts and YEAR_ONLY.match(parts[-1]) and year is None:
         year = parts.pop()
     if len(parts) >= 2:
         title = " - ".join(parts[:-1])
@@ -106,187 +184,385 @@ def guess_from_path(p: Path) -> Tuple[Optional[str], str, Optional[str]]:
     else:
         title, author = leaf, None
     if not author:
-        parent = clean_tail(p.parent.name)
+        parent = clean_tail(parent_name)
         author = parent if " " in parent else None
     title = PAREN_RX.sub("", title).strip()
     return author, title, year
 
-# ───── online lookup helpers ─────
-def openlib(author: Optional[str], title: str) -> Optional[dict]:
-    try:
-        q = f"title:{title}" + (f" author:{author}" if author else "")
-        r = SESSION.get("https://openlibrary.org/search.json",
-                        params={"q": q, "limit": 5}, timeout=10)
-        r.raise_for_status()
-        docs = r.json().get("docs", [])
-        best = max(docs, key=lambda d: fuzz.token_set_ratio(
-                   title, d.get("title", "")), default=None)
-        if not best: return None
-        return {
-            "title":   best.get("title"),
-            "authors": best.get("author_name", []),
-            "year":    str(best.get("first_publish_year")) if best.get("first_publish_year") else None
-        }
-    except Exception:
-        return None
+# ───── provider cache ─────
+# Answers are kept per (provider, author, title) in memory for this run and
+# in a shelve file beside the logs for later runs.  Providers raise on
+# network / parse errors; those results are not cached, so a transient
+# failure is retried next time.  An empty-but-successful lookup is cached
+# as an empty list.
+_MEM: dict[str, str] = {}
+_DB: Optional[shelve.Shelf] = None
+_DB_LOCK = threading.Lock()
+
+def _cache_db() -> Optional[shelve.Shelf]:
+    global _DB, CACHE_PATH
+    if _DB is None and CACHE_PATH is not None:
+        try:
+            _DB = shelve.open(str(CACHE_PATH))
+        except Exception as e:      # unreadable / foreign dbm file
+            rprint(f"[yellow]cache disabled:[/] {CACHE_PATH} – {e}")
+            CACHE_PATH = None
+            return None
+        atexit.register(_DB.close)
+    return _DB
+
+def _norm(s: Optional[str]) -> str:
+    return PAREN_RX.sub("", s or "").lower().strip()
+
+def cached(name: str, ttl: int = CACHE_TTL):
+    """Cache a provider's answer, stored as JSON so every hit is a fresh list."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(author: Optional[str], title: str) -> List[dict]:
+            key = f"{CACHE_FORMAT}\x1f{name}\x1f{_norm(author)}\x1f{_norm(title)}"
+            with _DB_LOCK:
+                blob = _MEM.get(key)
+                if blob is None and (db := _cache_db()) is not None:
+                    stamp, stored = db.get(key, (0.0, None))
+                    if stored is not None and time.time() - stamp < ttl:
+                        blob = _MEM[key] = stored
+            if blob is not None:
+                return json_loads(blob)
+            try:
+                metas = fn(author, title)
+            except Exception:
+                return []
+            blob = json.dumps(metas, ensure_ascii=False)
+            with _DB_LOCK:
+                _MEM[key] = blob
+                if (db := _cache_db()) is not None:
+                    db[key] = (time.time(), blob)
+            return metas
+        return wrapper
+    return deco
 
-def gbooks(author: Optional[str], title: str) -> Optional[dict]:
-    try:
-        q = f'intitle:"{title}"' + (f'+inauthor:"{author}"' if author else "")
-        r = SESSION.get("https://www.googleapis.com/books/v1/volumes",
-                        params={"q": q, "maxResults": 5}, timeout=10)
+# ───── online lookup helpers ─────
+FETCH_CAP = 2 * 1024 * 1024   # give up on a search page that runs past this
+TAG_SPAN = 1024               # longest start tag that may straddle two chunks
+
+def _fetch_head(url: str, params: dict, anchor: re.Pattern, item: re.Pattern,
+                count: int = 2) -> bytes:
+    """GET a search page, keeping it only until ``count`` results have started.
+
+    Results are counted with ``item`` from the first match of ``anchor``, the
+    result list's opening tag, so the same markup in scripts or headers above
+    the list cannot end the page early.  Only the first result is parsed, so
+    the response is closed there and the rest is never downloaded (the
+    connection is dropped rather than reused).  A page that reaches FETCH_CAP
+    first raises instead, so a cut-off first result is never cached.
+    """
+    with SESSION.get(url, params=params, timeout=10, stream=True) as r:
         r.raise_for_status()
-        items = r.json().get("items", [])
-        info = max(items, key=lambda i: fuzz.token_set_ratio(
-                   title, i["volumeInfo"].get("title", "")), default=None)
-        if not info: return None
-        info = info["volumeInfo"]
-        return {
-            "title":   info.get("title"),
-            "authors": info.get("authors", []),
-            "year":    info.get("publishedDate", "")[:4] or None
-        }
-    except Exception:
+        buf, pos, seen = bytearray(), None, 0
+        for chunk in r.iter_content(16384):
+            back = max(0, len(buf) - TAG_SPAN)
+            buf += chunk
+            if pos is None and (m := anchor.search(buf, back)):
+                pos = m.start()
+            if pos is not None:
+                for m in item.finditer(buf, max(pos, back)):
+                    seen, pos = seen + 1, m.end()
+                    if seen >= count:
+                        break
+            if seen >= count:
+                break
+            if len(buf) >= FETCH_CAP:
+                raise requests.HTTPError(f"{url}: first result not over after {FETCH_CAP} bytes")
+        return bytes(buf)
+
+# Only four fields of the first search result are needed, so the page is
+# never parsed into a tree: start tags are found with byte regexes and
+# each element's end by counting nested tags of the same name.
+def _open_rx(tag: str, cls: Optional[str] = None) -> re.Pattern:
+    cls_rx = rf'[^>]*\bclass="[^"]*\b{cls}\b[^"]*"' if cls else ""
+    return re.compile(rf"<({tag})\b{cls_rx}[^>]*>".encode(), re.I)
+
+@functools.lru_cache(maxsize=None)
+def _tags_rx(tag: bytes) -> re.Pattern:
+    return re.compile(rb"<(/?)" + re.escape(tag) + rb"\b[^>]*>", re.I)
+
+def _element(page: bytes, open_rx: re.Pattern, pos: int = 0) -> Optional[Tuple[bytes, int]]:
+    """Inner markup of the first element matching ``open_rx``, and where it ends."""
+    if not (m := open_rx.search(page, pos)):
         return None
-
-def goodreads(author: Optional[str], title: str) -> Optional[dict]:
-    try:
-        q = f"{title} {author}" if author else title
-        html = SESSION.get(
-            "https://www.goodreads.com/search",
-            params={"q": q},
-            timeout=10,
-        ).text
-        soup = BeautifulSoup(html, "html.parser")
-        row = soup.select_one("table.tableList tr")
-        if not row:
-            return None
-        title_el = row.select_one("a.bookTitle span")
-        author_el = row.select_one("a.authorName span")
-        year_el = row.select_one("span.minirating")
-        if not title_el or not author_el:
-            return None
-        year = None
-        if year_el:
-            m = re.search(r"(\d{4})", year_el.get_text())
-            if m:
-                year = m.group(1)
-        return {
-            "title": title_el.get_text(strip=True),
-            "authors": [author_el.get_text(strip=True)],
-            "year": year,
-        }
-    except Exception:
-        return None
-
-def audible(author: Optional[str], title: str) -> Optional[dict]:
-    try:
-        q = f"{title} {author}" if author else title
-        html = SESSION.get(
-            "https://www.audible.com/search",
-            params={"keywords": q},
-            headers={"User-Agent": "Mozilla/5.0"},
-            timeout=10,
-        ).text
-        soup = BeautifulSoup(html, "html.parser")
-        item = soup.select_one("li.bc-list-item.productListItem")
-        if not item:
-            return None
-        title_el = item.select_one("h3")
-        author_el = item.select_one(".authorLabel a")
-        series_el = item.select_one(".seriesLabel a")
-        year_el = item.select_one(".releaseDateLabel+span")
-        if not title_el or not author_el:
+    depth = 1
+    for t in _tags_rx(m.group(1).lower()).finditer(page, m.end()):
+        depth += -1 if t.group(1) else 1
+        if depth == 0:
+            return page[m.end():t.start()], t.end()
+    return page[m.end():], len(page)        # cut-off page: keep the rest
+
+def _first(page: bytes, *path: re.Pattern) -> Optional[bytes]:
+    """Descend through nested elements, like a CSS descendant selector."""
+    for rx in path:
+        if (el := _element(page, rx)) is None:
             return None
-        year = None
-        if year_el:
-            m = re.search(r"\d{4}", year_el.get_text())
-            if m:
-                year = m.group(0)
-        return {
-            "title": title_el.get_text(strip=True),
-            "authors": [author_el.get_text(strip=True)],
-            "year": year,
-            "series": series_el.get_text(strip=True) if series_el else None,
-        }
-    except Exception:
-        return None
+        page = el[0]
+    return page
+
+_MARKUP = re.compile(rb"<[^>]*>")
+
+def _text(fragment: bytes) -> str:
+    text = html.unescape(_MARKUP.sub(b" ", fragment).decode("utf-8", "replace"))
+    return " ".join(text.split())
+
+GR_TABLE   = _open_rx("table", "tableList")
+GR_ROW     = _open_rx("tr")
+GR_TITLE   = (_open_rx("a", "bookTitle"), _open_rx("span"))
+GR_AUTHOR  = (_open_rx("a", "authorName"), _open_rx("span"))
+GR_RATING  = _open_rx("span", "minirating")
+AUD_ITEM   = _open_rx("li", "productListItem")
+AUD_TITLE  = _open_rx("h3")
+AUD_AUTHOR = (_open_rx(r"\w+", "authorLabel"), _open_rx("a"))
+AUD_SERIES = (_open_rx(r"\w+", "seriesLabel"), _open_rx("a"))
+AUD_DATE   = _open_rx(r"\w+", "releaseDateLabel")
+NEXT_SPAN  = re.compile(rb"[^<]*<(span)\b[^>]*>", re.I)     # "+span": the very next element
+YEAR4_RX   = re.compile(r"\d{4}")
+
+@cached("openlib")
+def openlib(author: Optional[str], title: str) -> List[dict]:
+    q = f"title:{title}" + (f" author:{author}" if author else "")
+    r = SESSION.get("https://openlibrary.org/search.json",
+                    params={"q": q, "limit": 5}, timeout=10)
+    r.raise_for_status()
+    return [{
+        "title":   d.get("title"),
+        "authors": d.get("author_name", []),
+        "year":    str(d.get("first_publish_year")) if d.get("first_publish_year") else None
+    } for d in json_loads(r.content).get("docs", [])]
+
+@cached("gbooks")
+def gbooks(author: Optional[str], title: str) -> List[dict]:
+    q = f'intitle:"{title}"' + (f'+inauthor:"{author}"' if author else "")
+    r = SESSION.get("https://www.googleapis.com/books/v1/volumes",
+                    params={"q": q, "maxResults": 5}, timeout=10)
+    r.raise_for_status()
+    return [{
+        "title":   info.get("title"),
+        "authors": info.get("authors", []),
+        "year":    info.get("publishedDate", "")[:4] or None
+    } for info in (i["volumeInfo"] for i in json_loads(r.content).get("items", []))]
+
+@cached("goodreads")
+def goodreads(author: Optional[str], title: str) -> List[dict]:
+    q = f"{title} {author}" if author else title
+    page = _fetch_head(
+        "https://www.goodreads.com/search",
+        {"q": q},
+        GR_TABLE, GR_TITLE[0],
+    )
+    table = GR_TABLE.search(page)
+    row = table and _element(page, GR_ROW, table.end())
+    if not row:
+        return []
+    row = row[0]
+    title_el = _first(row, *GR_TITLE)
+    author_el = _first(row, *GR_AUTHOR)
+    year_el = _first(row, GR_RATING)
+    if title_el is None or author_el is None:
+        return []
+    year = None
+    if year_el is not None:
+        m = YEAR4_RX.search(_text(year_el))
+        if m:
+            year = m.group(0)
+    return [{
+        "title": _text(title_el),
+        "authors": [_text(author_el)],
+        "year": year,
+    }]
+
+@cached("audible")
+def audible(author: Optional[str], title: str) -> List[dict]:
+    q = f"{title} {author}" if author else title
+    page = _fetch_head(
+        "https://www.audible.com/search",
+        {"keywords": q},
+        AUD_ITEM, AUD_ITEM,
+    )
+    item = _first(page, AUD_ITEM)
+    if item is None:
+        return []
+    title_el = _first(item, AUD_TITLE)
+    author_el = _first(item, *AUD_AUTHOR)
+    series_el = _first(item, *AUD_SERIES)
+    year_el = None
+    if (label := _element(item, AUD_DATE)) and (m := NEXT_SPAN.match(item, label[1])):
+        year_el = _element(item, NEXT_SPAN, m.start())[0]
+    if title_el is None or author_el is None:
+        return []
+    year = None
+    if year_el is not None:
+        m = YEAR4_RX.search(_text(year_el))
+        if m:
+            year = m.group(0)
+    return [{
+        "title": _text(title_el),
+        "authors": [_text(author_el)],
+        "year": year,
+        "series": _text(series_el) if series_el is not None else None,
+    }]
+
+CHEAP_ENOUGH = 85      # Open Library / Google Books score that skips scraping
+
+# provider threads are shared by every best_match() call instead of being
+# started and joined once per leaf
+_EXEC = ThreadPoolExecutor(max_workers=16, thread_name_prefix="abprov")
+atexit.register(_EXEC.shutdown, wait=True)
 
 def best_match(author: Optional[str], title: str, client: AbClient = AB) -> tuple[Optional[tuple[int, dict]], dict[str, tuple[int, dict]]]:
     """Query metadata providers and return the best hit along with all scores."""
     candidates: list[tuple[int, dict]] = []
     results: dict[str, tuple[int, dict]] = {}
 
-    def add_result(name: str, meta: Optional[dict]):
-        if meta and meta.get("title"):
-            score = fuzz.token_set_ratio(title.lower(), meta["title"].lower())
-            meta["source"] = name
-            pair = (score, meta)
-            candidates.append(pair)
-            results[name] = pair
-
-    # audible first when enabled (internal switch)
-    if client.is_on("audible_first", default=True, internal=True):
-        add_result("audible", audible(author, title))
-        if "audible" in results and results["audible"][0] >= 80:
-            return results["audible"], results
-
-    providers = [("openlib", openlib), ("gbooks", gbooks)]
-    if client.is_on("use_goodreads"):
-        providers.append(("goodreads", goodreads))
-
-    with ThreadPoolExecutor(max_workers=len(providers)) as ex:
-        future_map = {ex.submit(fn, author, title): name for name, fn in providers}
+    def add_result(name: str, metas: List[dict]):
+        # every row a provider returned is scored, in one batched call,
+        # against the same scorer the final pick uses
+        rows = [m for m in metas if m.get("title")]
+        if not rows:
+            return
+        scored = process.extract(title, [m["title"] for m in rows],
+                                 scorer=fuzz.token_set_ratio,
+                                 processor=utils.default_process, limit=None)
+        for _, score, i in scored:
+            rows[i]["source"] = name
+            candidates.append((score, rows[i]))
+        results[name] = (scored[0][1], rows[scored[0][2]])
+
+    def run(providers, audible_wins: bool = False) -> bool:
+        """Query ``providers`` at once; True when audible wins outright."""
+        future_map = {_EXEC.submit(fn, author, title): name for name, fn in providers}
         for fut in as_completed(future_map):
             add_result(future_map[fut], fut.result())
+            if audible_wins and future_map[fut] == "audible" and "audible" in results \
+                    and results["audible"][0] >= 80:
+                for f in future_map:
+                    f.cancel()      # queued ones never run; stragglers finish alone
+                return True
+        return False
+
+    # the JSON APIs answer quickly; the slow HTML scrapers are only asked
+    # when neither of them is already convincing.  With audible_first on
+    # (internal switch, the default) a strong audible hit then wins outright.
+    run([("openlib", openlib), ("gbooks", gbooks)])
+    if max((sc for sc, _ in candidates), default=0) < CHEAP_ENOUGH:
+        scraped = [("audible", audible)]
+        if client.is_on("use_goodreads"):
+            scraped.append(("goodreads", goodreads))
+        if run(scraped, client.is_on("audible_first", default=True, internal=True)):
+            return results["audible"], results
 
     if not candidates:
         return None, results
     return max(candidates, key=lambda x: x[0]), results
 
+# leaves that guess the same author and title (a box set's volumes, a
+# rerun of the same leaf) share one best_match(); dict get/set are atomic,
+# so parallel leaves need no lock – at worst both look it up once.  A match
+# no provider answered is not kept, so a timeout is retried by the next leaf
+# (providers that did answer come from their own cache).
+_MATCHES: dict[tuple[Optional[str], str], tuple] = {}
+
+def _match(author: Optional[str], title: str):
+    key = (author, title)
+    if (hit := _MATCHES.get(key)) is None:
+        hit = best_match(author, title)
+        if hit[1]:
+            hit = _MATCHES.setdefault(key, hit)
+    return hit
+
 # ───── tag / strip functions ─────
 def strip_tags(file: Path):
     audio = MFile(str(file))
     if audio:
         audio.delete(); audio.save()
 
-def write_tags(file: Path, meta: dict, index: int = 0, total: int = 0):
+TAG_PADDING = 8192
+
+def _padding(info) -> int:
+    """Padding to leave after the tags: reserve 8 KiB, then keep what is left.
+
+    A file with no padding gets the full 8 KiB on its first save; later
+    saves keep the remaining padding as it is, so tags that change size
+    within it are rewritten in place instead of moving the audio data.
+    """
+    return info.padding if info.padding > 0 else TAG_PADDING
+
+class TagSet(NamedTuple):
+    """Book-wide frames / atoms, built once and shared by every track."""
+    id3: list           # mutagen ID3 frames, track number excluded
+    id3_text: dict      # HashKey → text of those frames, for the no-op check
+    mp4: dict           # MP4 atom → value list, track number excluded
+
+def tag_set(meta: dict) -> TagSet:
+    frames = [TIT2(3, meta["title"]), TALB(3, meta["title"]), TPE1(3, meta["author"])]
+    atoms = {"©nam": [meta["title"]], "©alb": [meta["title"]], "©ART": [meta["author"]]}
+    if meta["year"]:
+        frames.append(TDRC(3, meta["year"]))
+        atoms["©day"] = [meta["year"]]
+    if meta.get("series"):
+        frames.append(TXXX(3, desc="series", text=meta["series"]))
+        atoms["----:com.apple.iTunes:series"] = [meta["series"].encode("utf-8")]
+    return TagSet(frames, {f.HashKey: list(map(str, f.text)) for f in frames}, atoms)
+
+def _id3_text(audio) -> Optional[dict]:
+    """HashKey → text of every frame, or None if any frame has no text."""
+    out = {}
+    for k, f in audio.items():
+        if (text := getattr(f, "text", None)) is None:
+            return None
+        out[k] = list(map(str, text))
+    return out
+
+def write_tags(file: Path, meta: dict, index: int = 0, total: int = 0,
+               tags: Optional[TagSet] = None):
+    """Tag one track; pass ``tags=tag_set(meta)`` when tagging a whole book."""
     ext = file.suffix.lower()
+    tags = tags or tag_set(meta)
     if ext == ".mp3":
         try:
             audio = ID3(str(file))
         except ID3NoHeaderError:
             audio = ID3()
-        audio.clear()
-        audio["TIT2"] = TIT2(3, meta["title"])
-        audio["TALB"] = TALB(3, meta["title"])
-        audio["TPE1"] = TPE1(3, meta["author"])
-        if meta["year"]:
-            audio["TDRC"] = TDRC(3, meta["year"])
-        if meta.get("series"):
-            audio.add(TXXX(3, desc="series", text=meta["series"]))
+        frames, want = tags.id3, tags.id3_text
         if index:
-            audio["TRCK"] = TRCK(3, f"{index}/{total or index}")
-        audio.save(str(file))
+            trck = TRCK(3, f"{index}/{total or index}")
+            frames, want = frames + [trck], {**want, "TRCK": [str(trck)]}
+        # a re-run over an already tagged book reads instead of writing:
+        # the clear-and-rewrite below would produce exactly these frames.
+        # Frames without text (covers, chapters, PRIV) are never written
+        # here, so any of them means the file still needs the rewrite.
+        if _id3_text(audio) == want:
+            return
+        audio.clear()
+        for f in frames:
+            audio.add(f)
+        audio.save(str(file), padding=_padding)
     elif ext in {".m4a", ".m4b"}:
         mp4 = MP4(str(file))
-        mp4.clear()
-        mp4["©nam"] = meta["title"]
-        mp4["©alb"] = meta["title"]
-        mp4["©ART"] = meta["author"]
-        if meta["year"]:
-            mp4["©day"] = meta["year"]
-        if meta.get("series"):
-            mp4["----:com.apple.iTunes:series"] = [meta["series"].encode("utf-8")]
+        tags = tags.mp4
         if index:
-            mp4["trkn"] = [(index, total or 0)]
-        mp4.save()
+            tags = {**tags, "trkn": [(index, total or 0)]}
+        if mp4.tags is not None and {k: list(v) for k, v in mp4.tags.items()} == tags:
+            return
+        mp4.clear()
+        for k, v in tags.items():
+            mp4[k] = v
+        mp4.save(padding=_padding)
 
 def export_metadata(path: Path, meta: dict):
     target = path if path.is_dir() else path.parent
     target.mkdir(exist_ok=True)
-    with (target / "metadata.json").open("w", encoding="utf-8") as fh:
-        json.dump(meta, fh, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        (target / "metadata.json").write_bytes(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
+    else:
+        with (target / "metadata.json").open("w", encoding="utf-8") as fh:
+            json.dump(meta, fh, ensure_ascii=False, indent=2)
     root = ET.Element("audiobook")
     for k, v in meta.items():
         if v:
@@ -295,56 +571,57 @@ def export_metadata(path: Path, meta: dict):
     ET.ElementTree(root).write(target / "book.nfo", encoding="utf-8", xml_declaration=True)
 
 # ───── process one leaf ─────
-def process_leaf(path: Path, args):
+def process_leaf(path: Path, args, files: Optional[List[Path]] = None):
+    """Tag or strip one leaf; ``files`` is its audio list from walk_leaves()."""
     # skip Unknown Author
     if path.name == "Unknown Author" or path.parent.name == "Unknown Author":
-        rprint("• skip Unknown Author:", path)
+        say("• skip Unknown Author:", path)
         log("SKIP", str(path)); return
+    if files is None:
+        files = [path] if path.is_file() else audio_files(path)
 
     # strip mode
     if args.striptags:
-        targets = [path] if path.is_file() else [f for f in path.rglob("*") if f.suffix.lower() in AUDIO_EXTS]
+        targets = files
         ok = 0
         for f in targets:
             try:
                 strip_tags(f); ok += 1
             except MutagenError:
                 log("ERR", f"strip {f}")
-        rprint(f"[cyan]→[/] {path}  [green]tags stripped ({ok}/{len(targets)})[/]")
+        say(f"[cyan]→[/] {path}  [green]tags stripped ({ok}/{len(targets)})[/]")
         log("STRIP", f"{path}  ({ok}/{len(targets)})")
         return
 
     # guess
     a_guess, t_guess, y_guess = guess_from_path(path)
-    rprint(f"[cyan]→[/] {path}")
-    rprint(f"  guess: [italic]{t_guess}[/] by {a_guess or '?'} ({y_guess or '?'})")
+    say(f"[cyan]→[/] {path}")
+    say(f"  guess: [italic]{t_guess}[/] by {a_guess or '?'} ({y_guess or '?'})")
 
-    result, scores = best_match(a_guess, t_guess)
+    result, scores = _match(a_guess, t_guess)
     if not result:
-        rprint("  [red] • no match[/]")
+        say("  [red] • no match[/]")
         log("NOMATCH", str(path))
         review_log(path, "no_match")
         return
     score, hit = result
 
     for name, (sc, _) in sorted(scores.items(), key=lambda x: -x[1][0]):
-        rprint(f"  {name:>9}: {sc}")
+        say(f"  {name:>9}: {sc}")
 
     author_hit = ", ".join(hit["authors"]) or a_guess or "Unknown"
-    rprint(f"  match: [bold]{hit['title']}[/] by {author_hit} ({hit['year'] or '?'})")
+    say(f"  match: [bold]{hit['title']}[/] by {author_hit} ({hit['year'] or '?'})")
     if hit.get("series"):
-        rprint(f"  series: {hit['series']}")
-    rprint(f"  provider: {hit['source']}")
+        say(f"  series: {hit['series']}")
+    say(f"  provider: {hit['source']}")
 
     if score < 60:
-        rprint("  [yellow]⚠ low confidence – double-check[/]")
+        say("  [yellow]⚠ low confidence – double-check[/]")
     if score < 70 and not args.yes:
         if args.no:
             proceed = False
-        elif hasattr(Confirm, "ask"):
-            proceed = Confirm.ask("  tag with this metadata?", default=False)
         else:
-            proceed = Confirm("tag with this metadata?", default=False)
+            proceed = _confirm("  tag with this metadata?", default=False)
         if not proceed:
             log("SKIP", str(path))
             review_log(path, "user_skip")
@@ -356,30 +633,77 @@ def process_leaf(path: Path, args):
         "year": hit["year"],
         "series": hit.get("series"),
     }
-    targets = [path] if path.is_file() else sorted(
-        [f for f in path.rglob("*") if f.suffix.lower() in AUDIO_EXTS]
-    )
-    ok = 0
-    for idx, f in enumerate(targets, 1):
+    targets = sorted(files)
+    tagset = tag_set(meta)          # frames built once, shared by every track
+
+    def _safe_write(item: Tuple[int, Path]) -> int:
+        idx, f = item
         try:
-            write_tags(f, meta, idx, len(targets)); ok += 1
+            write_tags(f, meta, idx, len(targets), tagset)
+            return 1
         except (MutagenError, MP4StreamInfoError):
             log("ERR", f"tag {f}")
+            return 0
+
+    # mutagen's file reads and writes release the GIL, so a few threads
+    # keep the disk busy on multi-file books
+    if len(targets) > 1:
+        with ThreadPoolExecutor(max_workers=min(TAG_WORKERS, len(targets))) as ex:
+            ok = sum(ex.map(_safe_write, enumerate(targets, 1)))
+    else:
+        ok = sum(map(_safe_write, enumerate(targets, 1)))
     label = "OK" if ok == len(targets) else "ERR"
-    rprint(f"  [green]tagged {ok}/{len(targets)} file(s)[/]")
+    say(f"  [green]tagged {ok}/{len(targets)} file(s)[/]")
     log(label, f"{path}  ({ok}/{len(targets)})")
     if label == "OK":
         export_metadata(path, meta)
 
 # ───── leaf finder ─────
-def walk_leaves(root: Path) -> List[Path]:
+Leaf = Tuple[Path, List[Path]]     # folder and every audio file below it
+
+def _scan(path: str, leaves: List[Leaf]) -> Tuple[bool, List[str]]:
+    """Collect leaves below ``path``.
+
+    Returns whether ``path`` holds audio itself, and the audio files of its
+    whole subtree.  One ``scandir`` per folder: the same listing answers
+    "audio here?", lists the files and names the sub-folders, whose answers
+    come back from the recursion – so tagging a leaf needs no second walk.
+    """
+    try:
+        with os.scandir(path) as it:
+            here, files, subdirs = False, [], []
+            for e in it:
+                hit = _audio(e.name)
+                here = here or hit
+                if e.is_dir(follow_symlinks=False):
+                    subdirs.append(e.path)
+                elif hit:
+                    files.append(e.path)
+    except OSError:
+        return False, []
+    slot = len(leaves)              # parents are listed before their sub-folders
+    child_audio = False
+    for d in subdirs:
+        sub_here, sub_files = _scan(d, leaves)
+        child_audio = child_audio or sub_here
+        files += sub_files
+    if here and not child_audio:
+        leaves.insert(slot, (Path(path), [Path(f) for f in files]))
+    return here, files
+
+def audio_files(folder: Path) -> List[Path]:
+    """Every audio file below ``folder``, sub-folders included."""
+    return [Path(f) for f in _scan(str(folder), [])[1]]
+
+def walk_leaves(root: Path) -> List[Leaf]:
+    """Folders below ``root`` with audio and no sub-folder that has audio."""
     if root.is_file():
-        return [root]
-    leaves: List[Path] = []
-    for p in root.rglob("*"):
-        if p.is_dir() and has_audio(p) and not any(
-            c.is_dir() and has_audio(c) for c in p.iterdir()):
-            leaves.append(p)
+        return [(root, [root])]
+    leaves: List[Leaf] = []
+    with os.scandir(root) as it:
+        subdirs = [e.path for e in it if e.is_dir(follow_symlinks=False)]
+    for d in subdirs:
+        _scan(d, leaves)
     return leaves
 
 # ───── cli / main ─────
@@ -407,31 +731,49 @@ def main():
     ap.add_argument("--version", action="version", version=VERSION_INFO)
     args = ap.parse_args()
 
-    global LOG_PATH, REVIEW_PATH, DEBUG
+    global LOG_PATH, REVIEW_PATH, CACHE_PATH, DEBUG
     DEBUG = args.debug
     base = args.root if args.root.is_dir() else args.root.parent
     LOG_PATH = base / "tag_log.txt"
     REVIEW_PATH = base / "review_log.txt"
+    CACHE_PATH = base / ".abtools_cache"
 
     if not args.root.exists():
         sys.exit("path not found")
 
-    items = walk_leaves(args.root) if args.recurse else [args.root]
-    for leaf in items:
-        try:
-            if not args.commit:
-                rprint(f"[dim]preview:[/] {leaf}")
-                continue
-            process_leaf(leaf, args)
-        except Exception as e:
-            rprint(f"[red]ERR:[/] {leaf} – {e}")
-            if DEBUG:
-                import traceback
-                tb = traceback.format_exc()
-                rprint(tb)
-                log("ERR", f"{leaf} – {type(e).__name__}: {tb.strip()}")
-            else:
-                log("ERR", f"{leaf} – {type(e).__name__}")
+    items = walk_leaves(args.root) if args.recurse else [(args.root, None)]
+    # leaves are independent; once no prompt can come up, overlap their
+    # lookups and tag writes.  A prompt needs the console, so stay serial.
+    if args.commit and (args.yes or args.no or args.striptags) and len(items) > 1:
+        workers = min(LEAF_WORKERS, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for _ in ex.map(lambda item: _safe_process(item, args, buffered=True), items):
+                pass
+    else:
+        for item in items:
+            _safe_process(item, args)
+
+def _safe_process(item: Tuple[Path, Optional[List[Path]]], args, buffered: bool = False):
+    leaf, files = item
+    if buffered:
+        _OUT.lines = []
+    try:
+        if not args.commit:
+            say(f"[dim]preview:[/] {leaf}")
+            return
+        process_leaf(leaf, args, files)
+    except Exception as e:
+        say(f"[red]ERR:[/] {leaf} – {e}")
+        if DEBUG:
+            import traceback
+            tb = traceback.format_exc()
+            say(tb)
+            log("ERR", f"{leaf} – {type(e).__name__}: {tb.strip()}")
+        else:
+            log("ERR", f"{leaf} – {type(e).__name__}")
+    finally:
+        if buffered:
+            _flush_said()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,31 @@
+import re
+import combobook as cb
+
+# the regex pipeline _parse_leaf_name replaced
+LEAF_RX = re.compile(
+    r"^\s*(?:(?P<seq>\d+)\s*[-_]\s*)?(?P<title>.+?)\s*\(\s*(?P<year>\d{4})\s*\)\s*$")
+PAREN_RX = re.compile(r"\([^)]*\)")
+
+
+def _old_parse(name):
+    if m := LEAF_RX.match(name):
+        return m.group("seq"), m.group("title").strip(), m.group("year")
+    raw = PAREN_RX.sub("", cb.clean_tail(name)).strip()
+    y = cb.YEAR_RX.search(raw)
+    return None, raw, y.group(1) if y else None
+
+
+def test_parse_leaf_name_matches_the_old_regexes():
+    for name in ["5 - Jaws of Darkness (2003)", "12_Title ( 1999 ) ", "Title (2003)",
+                 "2003)", " (2003)", "(2003)", "5 - (2003)", "Title (Abridged) (2003)",
+                 "Title (20034)", "2001 - A Title (Unabridged) {64k}", "2001 A Title",
+                 "Title 01.02.03", "5 -", "Title (a)(b)"]:
+        assert cb._parse_leaf_name(name) == _old_parse(name), name
+
+
+def test_write_tags_counts_tracks_it_cannot_tag(tmp_path, monkeypatch):
+    monkeypatch.setattr(cb, "FFMPEG", None)
+    track = tmp_path / "01.wav"          # no in-place tagger for WAV
+    track.write_bytes(b"RIFF")
+    meta = cb.Meta(author="Frank Herbert", title="Dune")
+    assert cb.write_tags([track], meta) == 1
@@ -0,0 +1,46 @@
+from pathlib import Path
+from find_duplicates import find_dupes
+
+
+def _tree(tmp_path: Path) -> Path:
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "one.mp3").write_bytes(b"same")
+    (tmp_path / "a" / "b" / "two.MP3").write_bytes(b"same")
+    (tmp_path / "a" / "b" / "one.mp3").write_bytes(b"diff")
+    (tmp_path / "a" / "cover.jpg").write_bytes(b"same")
+    return tmp_path
+
+
+def test_finds_duplicates_by_hash(tmp_path):
+    dupes = dict(find_dupes(_tree(tmp_path)))
+    assert len(dupes) == 1
+    files = sorted(p.name for p in next(iter(dupes.values())))
+    assert files == ["one.mp3", "two.MP3"]
+
+
+def test_finds_duplicates_by_name(tmp_path):
+    dupes = dict(find_dupes(_tree(tmp_path), by="name"))
+    assert list(dupes) == ["one.mp3"]
+    assert len(dupes["one.mp3"]) == 2
+
+
+def test_same_ends_different_middle_are_not_duplicates(tmp_path):
+    edge = b"x" * (64 * 1024)
+    (tmp_path / "a.mp3").write_bytes(edge + b"1" + edge)
+    (tmp_path / "b.mp3").write_bytes(edge + b"2" + edge)
+    assert list(find_dupes(tmp_path)) == []
+
+
+def test_yields_each_size_group_separately(tmp_path):
+    for name, data in [("a.mp3", b"aa"), ("b.mp3", b"aa"),
+                       ("c.flac", b"ccc"), ("d.flac", b"ccc")]:
+        (tmp_path / name).write_bytes(data)
+    sets = [sorted(p.name for p in files) for _, files in find_dupes(tmp_path)]
+    assert sorted(sets) == [["a.mp3", "b.mp3"], ["c.flac", "d.flac"]]
+
+
+def test_suffix_case_does_not_matter(tmp_path):
+    (tmp_path / "a.mP3").write_bytes(b"same")
+    (tmp_path / "b.M4b").write_bytes(b"same")
+    sets = [sorted(p.name for p in files) for _, files in find_dupes(tmp_path)]
+    assert sets == [["a.mP3", "b.M4b"]]
@@ -0,0 +1,10 @@
+from flatten_discs import disc_sets_in
+
+
+def test_groups_disc_and_part_folders(tmp_path):
+    for name in ("Book (Disc 02)", "Book (Disc 01)", "Other (1 of 2)", "Title (2003)"):
+        (tmp_path / name).mkdir()
+    sets = dict(disc_sets_in(tmp_path))
+    assert sorted(sets) == ["Book", "Other"]
+    assert [n for n, _ in sets["Book"]] == [1, 2]
+    assert [p.name for _, p in sets["Other"]] == ["Other (1 of 2)"]
@@ -0,0 +1,41 @@
+from pathlib import Path
+from restructure_for_audiobookshelf import leaf_audio_dirs
+
+
+def test_leaf_audio_dirs(tmp_path):
+    for rel in ("Author/Book/Disc 1/a.mp3", "Author/Book/b.MP3",
+                "Author/Other/a.m4b", "Author/loose.mp3", "top.mp3",
+                "Author/Book/cover.jpg"):
+        f = tmp_path / rel
+        f.parent.mkdir(parents=True, exist_ok=True)
+        f.touch()
+    leaves = sorted(p.relative_to(tmp_path).as_posix() for p in leaf_audio_dirs(tmp_path))
+    assert leaves == ["Author/Book/Disc 1", "Author/Other"]
+
+
+def test_parse_folder_patterns():
+    from restructure_for_audiobookshelf import parse_folder
+    m = parse_folder(Path("Brandon Sanderson - Mistborn 1 - 2006 - The Final Empire {Michael Kramer}"))
+    assert (m.author, m.series, m.seq, m.year, m.title, m.narr) == (
+        "Brandon Sanderson", "Mistborn", "1", "2006", "The Final Empire", "Michael Kramer")
+    m = parse_folder(Path("Title [Series - 3] - Author"))
+    assert (m.author, m.series, m.seq, m.title) == ("Author", "Series", "3", "Title")
+    # pattern D takes author and series from the parent folder
+    m = parse_folder(Path("Title [Ser - 2] - Auth") / "[2001] Sub 64k")
+    assert (m.author, m.series, m.year, m.title) == ("Auth", "Ser", "2001", "Sub")
+    assert parse_folder(Path("Plain Title")) is None
+
+
+def test_flatten_discs_and_rename(tmp_path):
+    from restructure_for_audiobookshelf import flatten_discs, rename_tracks
+    for rel in ("intro.mp3", "Disc 2/a.mp3", "Disc 1/b.mp3", "Disc 1/a.MP3", "cover.jpg"):
+        f = tmp_path / rel
+        f.parent.mkdir(exist_ok=True)
+        f.write_text(rel)
+    flatten_discs(tmp_path, dry=False)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "Track 1.mp3", "Track 2.mp3", "Track 3.mp3", "Track 4.mp3", "cover.jpg"]
+    assert (tmp_path / "Track 2.mp3").read_text() == "Disc 1/a.MP3"
+    (tmp_path / "Track 2.mp3").unlink()
+    rename_tracks(tmp_path)
+    assert (tmp_path / "Track 3.mp3").read_text() == "Disc 2/a.mp3"
@@ -0,0 +1,177 @@
+import os
+import search_and_tag as sat
+
+
+def test_cached_provider_skips_failures(tmp_path, monkeypatch):
+    monkeypatch.setattr(sat, "CACHE_PATH", tmp_path / "cache")
+    monkeypatch.setattr(sat, "_DB", None)
+    monkeypatch.setattr(sat, "_MEM", {})
+    calls = []
+
+    @sat.cached("fake")
+    def fake(author, title):
+        calls.append(title)
+        if title == "boom":
+            raise OSError("offline")
+        return [{"title": title.title(), "authors": [author], "year": None}]
+
+    first = fake("Jane Doe", "Some Book (Unabridged)")
+    first[0]["source"] = "fake"
+    assert fake("jane doe", " some book ") == [
+        {"title": "Some Book (Unabridged)", "authors": ["Jane Doe"], "year": None}]
+    assert fake("Jane Doe", "boom") == []
+    assert fake("Jane Doe", "boom") == []
+    assert calls == ["Some Book (Unabridged)", "boom", "boom"]
+
+    sat._MEM.clear()                # a later run reads the shelve file
+    fake("Jane Doe", "Some Book")
+    assert len(calls) == 3
+    sat._DB.close()
+
+
+def test_walk_leaves_skips_folders_with_audio_below(tmp_path):
+    for rel in ("A/Book/01.mp3", "A/Book/cover.jpg", "A/Box/Vol 1/01.M4B",
+                "A/Box/notes.mp3", "B/readme.txt"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).touch()
+    leaves = dict(sat.walk_leaves(tmp_path))
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in leaves) == [
+        "A/Book", "A/Box/Vol 1"]
+    assert [f.name for f in leaves[tmp_path / "A" / "Book"]] == ["01.mp3"]
+
+
+def test_best_match_ranks_every_provider_row(monkeypatch):
+    class Client:
+        def is_on(self, name, default=False, internal=False):
+            return False
+    monkeypatch.setattr(sat, "openlib", lambda a, t: [
+        {"title": "Sand Dunes", "authors": ["Frank Herbert"], "year": "1969"},
+        {"title": "DUNE!", "authors": ["Frank Herbert"], "year": "1965"}])
+    monkeypatch.setattr(sat, "gbooks", lambda a, t: [])
+    monkeypatch.setattr(sat, "audible", lambda a, t: [
+        {"title": "The Godmakers", "authors": ["Frank Herbert"], "year": "1972"}])
+    (score, hit), scores = sat.best_match("Frank Herbert", "Dune", Client())
+    assert (hit["year"], hit["source"], score) == ("1965", "openlib", 100)
+    assert list(scores) == ["openlib"]      # confident enough: audible not asked
+
+    (score, hit), scores = sat.best_match("Frank Herbert", "The Godmakers", Client())
+    assert (hit["source"], score) == ("audible", 100)
+    assert sorted(scores) == ["audible", "openlib"]
+
+
+def test_best_match_scrapes_only_when_json_providers_are_unsure(monkeypatch):
+    class Client:                   # defaults: audible_first on, no goodreads
+        def is_on(self, name, default=False, internal=False):
+            return default
+
+    def no_scrape(a, t):
+        raise AssertionError("audible scraped despite a confident JSON hit")
+    monkeypatch.setattr(sat, "openlib", lambda a, t: [
+        {"title": "Sand Dunes", "authors": ["Frank Herbert"], "year": "1969"},
+        {"title": "Dune", "authors": ["Frank Herbert"], "year": "1965"}])
+    monkeypatch.setattr(sat, "gbooks", lambda a, t: [])
+    monkeypatch.setattr(sat, "audible", no_scrape)
+    (score, hit), scores = sat.best_match("Frank Herbert", "Dune", Client())
+    assert (hit["year"], score) == ("1965", 100)
+    assert list(scores) == ["openlib"]
+
+    # below the gate the scrapers are asked, and a strong audible hit wins
+    monkeypatch.setattr(sat, "audible", lambda a, t: [
+        {"title": "The Godmakers", "authors": ["Frank Herbert"], "year": "1972"}])
+    (score, hit), scores = sat.best_match("Frank Herbert", "The Godmakers", Client())
+    assert (hit["source"], score) == ("audible", 100)
+    assert scores["openlib"][0] < sat.CHEAP_ENOUGH
+
+
+def test_match_keeps_only_answered_lookups(monkeypatch):
+    answers = [(None, {}), ((90, {"title": "Dune"}), {"openlib": (90, {"title": "Dune"})})]
+    monkeypatch.setattr(sat, "_MATCHES", {})
+    monkeypatch.setattr(sat, "best_match", lambda a, t: answers.pop(0))
+    assert sat._match("Frank Herbert", "Dune") == (None, {})     # every provider failed
+    assert sat._match("Frank Herbert", "Dune")[0] == (90, {"title": "Dune"})
+    assert sat._match("Frank Herbert", "Dune")[0] == (90, {"title": "Dune"})
+    assert answers == []
+
+
+def test_write_tags_skips_files_already_tagged(tmp_path):
+    track = tmp_path / "01.mp3"
+    track.write_bytes((b"\xff\xfb\x90\x64" + b"\x00" * 413) * 20)
+    meta = {"title": "Dune", "author": "Frank Herbert", "year": "1965", "series": None}
+    sat.write_tags(track, meta, 1, 2)
+    os.utime(track, ns=(1, 1))
+    sat.write_tags(track, meta, 1, 2)
+    assert track.stat().st_mtime_ns == 1
+    sat.write_tags(track, meta, 2, 2)
+    assert track.stat().st_mtime_ns != 1
+
+
+def test_write_tags_rewrites_files_with_cover_art(tmp_path):
+    from mutagen.id3 import APIC, ID3
+    track = tmp_path / "01.mp3"
+    track.write_bytes((b"\xff\xfb\x90\x64" + b"\x00" * 413) * 20)
+    meta = {"title": "Dune", "author": "Frank Herbert", "year": "1965", "series": None}
+    sat.write_tags(track, meta, 1, 2)
+    tags = ID3(str(track))
+    tags.add(APIC(3, "image/jpeg", 3, "Cover", b"\xff\xd8jpeg"))
+    tags.save(str(track))
+    sat.write_tags(track, meta, 1, 2)
+    assert "APIC:Cover" not in ID3(str(track))
+    os.utime(track, ns=(1, 1))
+    sat.write_tags(track, meta, 1, 2)
+    assert track.stat().st_mtime_ns == 1
+
+
+def test_write_tags_pads_an_untagged_file(tmp_path):
+    from mutagen.id3 import ID3
+    track = tmp_path / "01.mp3"
+    track.write_bytes((b"\xff\xfb\x90\x64" + b"\x00" * 413) * 20)
+    sat.write_tags(track, {"title": "Dune", "author": "Frank Herbert",
+                           "year": None, "series": None})
+    seen = []
+    ID3(str(track)).save(str(track), padding=lambda info: seen.append(info.padding) or 0)
+    assert seen[0] >= sat.TAG_PADDING
+
+
+def test_write_tags_reserves_padding_once(tmp_path):
+    from mutagen.id3 import ID3, TIT2
+    track = tmp_path / "01.mp3"
+    track.write_bytes((b"\xff\xfb\x90\x64" + b"\x00" * 413) * 20)
+    tags = ID3()
+    tags.add(TIT2(3, "old"))
+    tags.save(str(track), padding=lambda info: 0)
+    meta = {"title": "Dune", "author": "Frank Herbert", "year": None, "series": None}
+    sat.write_tags(track, meta)
+    size = track.stat().st_size
+    assert ID3(str(track)).size >= sat.TAG_PADDING
+    sat.write_tags(track, dict(meta, title="Dune Messiah"))
+    assert track.stat().st_size == size
+
+
+def test_goodreads_counts_results_only_inside_the_list(monkeypatch):
+    row = ('<tr><td><a class="bookTitle" href="/b/{0}"><span>Book {0}</span></a>'
+           '<a class="authorName"><span>Author {0}</span></a>'
+           '<span class="minirating">4.1 avg rating — published 19{0}0</span></td></tr>')
+    page = ('<html><script>var t = \'<a class="bookTitle"><a class="bookTitle">\';</script>'
+            + "x" * 40000 + '<table class="tableList">'
+            + "".join(row.format(n) for n in range(1, 6)) + "</table></html>").encode()
+    read = []
+
+    class Resp:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, size):
+            for i in range(0, len(page), 100):
+                read.append(i)
+                yield page[i:i + 100]
+
+    monkeypatch.setattr(sat.SESSION, "get", lambda *a, **kw: Resp())
+    assert sat.goodreads.__wrapped__(None, "Book") == [
+        {"title": "Book 1", "authors": ["Author 1"], "year": "1910"}]
+    assert read[-1] < page.index(b'/b/3')               # rest of the page never read